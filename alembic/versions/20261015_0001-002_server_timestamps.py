@@ -0,0 +1,58 @@
+"""Server-side timestamps
+
+Revision ID: 002_server_timestamps
+Revises: 001_initial
+Create Date: 2026-10-15 00:01:00
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_server_timestamps'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TIMESTAMP_COLUMNS = {
+    'users': ('created_at',),
+    'wallet_bindings': ('created_at',),
+    'bridge_sessions': ('created_at', 'updated_at'),
+    'transactions': ('created_at', 'updated_at'),
+    'alerts': ('created_at',),
+}
+
+
+def upgrade() -> None:
+    # Existing values were written with datetime.utcnow(), so interpret them as UTC
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                existing_nullable=False,
+                server_default=sa.func.now(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=False,
+                server_default=None,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
@@ -0,0 +1,43 @@
+"""Binary UUIDv7 session IDs
+
+Revision ID: 003_binary_session_id
+Revises: 002_server_timestamps
+Create Date: 2026-10-15 00:02:00
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_binary_session_id'
+down_revision: Union[str, None] = '002_server_timestamps'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing IDs are uuid4().hex, i.e. 32 hex chars -> 16 raw bytes
+    op.alter_column(
+        'bridge_sessions',
+        'session_id',
+        type_=sa.LargeBinary(length=16),
+        existing_type=sa.String(length=64),
+        existing_nullable=False,
+        postgresql_using="decode(session_id, 'hex')",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'bridge_sessions',
+        'session_id',
+        type_=sa.String(length=64),
+        existing_type=sa.LargeBinary(length=16),
+        existing_nullable=False,
+        postgresql_using="encode(session_id, 'hex')",
+    )
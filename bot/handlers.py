@@ -22,11 +22,15 @@ from bot.keyboards import (
 )
 from bot.status_handler import StatusCommandHandler
 from bot.storage import BindingStorage
-from data.database import get_session_factory
-from data.repositories import BridgeSessionRepository, TransactionRepository, UserRepository
+from data.repositories import (
+    BridgeSessionRepository,
+    TransactionRepository,
+    UnitOfWork,
+    UserRepository,
+)
 from watcher.cfscan import CFSCANIntegration
 from watcher.evm_tracker import EVMTransactionTracker
-from watcher.validators import validate_address
+from watcher.validators import validate_address, validate_tx_hash
 
 
 logger = logging.getLogger(__name__)
@@ -35,9 +39,6 @@ logger = logging.getLogger(__name__)
 status_handler = StatusCommandHandler()
 cfscan = CFSCANIntegration()
 
-# Get database session factory
-SessionFactory = get_session_factory()
-
 
 class BridgeFlow(StatesGroup):
     """States for bridge creation flow."""
@@ -196,59 +197,59 @@ def register_handlers(dp: Router) -> None:
         await message.answer(faq_text, disable_web_page_preview=True)
 
     @router.message(Command("stats"))
-    async def cmd_stats(message: types.Message) -> None:
+    async def cmd_stats(message: types.Message, uow: UnitOfWork) -> None:
         """Show user statistics."""
-        async with SessionFactory() as db_session:
-            user_repo = UserRepository(db_session)
-            user = await user_repo.get_or_create(
-                telegram_id=message.from_user.id,
-                username=message.from_user.username,
-            )
+        db_session = uow.session
+        user_repo = UserRepository(db_session)
+        user = await user_repo.get_or_create(
+            telegram_id=message.from_user.id,
+            username=message.from_user.username,
+        )
 
-            # Get statistics
-            session_repo = BridgeSessionRepository(db_session)
-            tx_repo = TransactionRepository(db_session)
+        # Get statistics
+        session_repo = BridgeSessionRepository(db_session)
+        tx_repo = TransactionRepository(db_session)
 
-            sessions = await session_repo.list_by_user(user.id, limit=1000)
-            
-            # Count by status
-            total_sessions = len(sessions)
-            active_sessions = sum(1 for s in sessions if s.status in ["pending", "processing"])
-            completed_sessions = sum(1 for s in sessions if s.status == "completed")
-            
-            # Get pending transactions count
-            pending_txs = await tx_repo.list_pending(limit=1000)
-            user_pending = sum(1 for tx in pending_txs if any(s.id == tx.session_id for s in sessions))
+        sessions = await session_repo.list_by_user(user.id, limit=1000)
+        
+        # Count by status
+        total_sessions = len(sessions)
+        active_sessions = sum(1 for s in sessions if s.status in ["pending", "processing"])
+        completed_sessions = sum(1 for s in sessions if s.status == "completed")
+        
+        # Get pending transactions count
+        pending_txs = await tx_repo.list_pending(limit=1000)
+        user_pending = sum(1 for tx in pending_txs if any(s.id == tx.session_id for s in sessions))
 
-            # Calculate success rate
-            if total_sessions > 0:
-                success_rate = (completed_sessions / total_sessions) * 100
-            else:
-                success_rate = 0
+        # Calculate success rate
+        if total_sessions > 0:
+            success_rate = (completed_sessions / total_sessions) * 100
+        else:
+            success_rate = 0
 
-            stats_text = (
-                f"📊 <b>Your Statistics</b>\n\n"
-                f"👤 <b>User:</b> {message.from_user.full_name}\n"
-                f"🆔 <b>ID:</b> <code>{message.from_user.id}</code>\n\n"
-                
-                f"<b>🌉 Bridge Sessions:</b>\n"
-                f"• Total: {total_sessions}\n"
-                f"• Active: {active_sessions} ⏳\n"
-                f"• Completed: {completed_sessions} ✅\n"
-                f"• Success Rate: {success_rate:.1f}%\n\n"
-                
-                f"<b>📦 Transactions:</b>\n"
-                f"• Tracking: {user_pending} ⏳\n\n"
-                
-                f"<b>🔥 Quick Commands:</b>\n"
-                f"/mysessions - View all sessions\n"
-                f"/track - Track new TX\n"
-                f"/faq - Frequently asked questions\n\n"
-                
-                f"<i>Thank you for using Cellframe Bridge! 🚀</i>"
-            )
+        stats_text = (
+            f"📊 <b>Your Statistics</b>\n\n"
+            f"👤 <b>User:</b> {message.from_user.full_name}\n"
+            f"🆔 <b>ID:</b> <code>{message.from_user.id}</code>\n\n"
+            
+            f"<b>🌉 Bridge Sessions:</b>\n"
+            f"• Total: {total_sessions}\n"
+            f"• Active: {active_sessions} ⏳\n"
+            f"• Completed: {completed_sessions} ✅\n"
+            f"• Success Rate: {success_rate:.1f}%\n\n"
             
-            await message.answer(stats_text)
+            f"<b>📦 Transactions:</b>\n"
+            f"• Tracking: {user_pending} ⏳\n\n"
+            
+            f"<b>🔥 Quick Commands:</b>\n"
+            f"/mysessions - View all sessions\n"
+            f"/track - Track new TX\n"
+            f"/faq - Frequently asked questions\n\n"
+            
+            f"<i>Thank you for using Cellframe Bridge! 🚀</i>"
+        )
+        
+        await message.answer(stats_text)
 
     @router.message(Command("bind"))
     async def cmd_bind(message: types.Message, state: FSMContext) -> None:
@@ -269,55 +270,57 @@ def register_handlers(dp: Router) -> None:
         await message.answer(bind_text)
 
     @router.message(Command("mysessions"))
-    async def cmd_my_sessions(message: types.Message) -> None:
+    async def cmd_my_sessions(message: types.Message, uow: UnitOfWork) -> None:
         """Show user's bridge sessions."""
         try:
-            async with SessionFactory() as db_session:
-                user_repo = UserRepository(db_session)
-                user = await user_repo.get_or_create(
-                    telegram_id=message.from_user.id,
-                    username=message.from_user.username,
+            db_session = uow.session
+            user_repo = UserRepository(db_session)
+            user = await user_repo.get_or_create(
+                telegram_id=message.from_user.id,
+                username=message.from_user.username,
+            )
+            
+            session_repo = BridgeSessionRepository(db_session)
+            sessions = await session_repo.list_by_user(user.id, limit=10)
+            
+            if not sessions:
+                await message.answer(
+                    "You don't have any bridge sessions yet.\n"
+                    "Use /bridge to create one!"
                 )
+                return
+
+            response = "📚 <b>Your Bridge Sessions</b>\n\n"
+            for idx, session in enumerate(sessions, 1):
+                status_emoji = {
+                    "pending": "⏳",
+                    "processing": "🔄",
+                    "completed": "✅",
+                    "failed": "❌",
+                }.get(session.status, "❓")
                 
-                session_repo = BridgeSessionRepository(db_session)
-                sessions = await session_repo.list_by_user(user.id, limit=10)
-                
-                if not sessions:
-                    await message.answer(
-                        "You don't have any bridge sessions yet.\n"
-                        "Use /bridge to create one!"
-                    )
-                    return
-
-                response = "📚 <b>Your Bridge Sessions</b>\n\n"
-                for idx, session in enumerate(sessions, 1):
-                    status_emoji = {
-                        "pending": "⏳",
-                        "processing": "🔄",
-                        "completed": "✅",
-                        "failed": "❌",
-                    }.get(session.status, "❓")
-                    
-                    direction_display = session.direction.replace('_to_', ' → ').replace('_', ' ').title()
-                    
-                    response += (
-                        f"{idx}. {status_emoji} <b>{session.token}</b> {session.amount}\n"
-                        f"   Direction: {direction_display}\n"
-                        f"   Status: {session.status}\n"
-                        f"   ID: <code>{session.session_id}</code>\n\n"
-                    )
+                direction_display = session.direction.replace('_to_', ' → ').replace('_', ' ').title()
                 
-                await message.answer(response)
+                response += (
+                    f"{idx}. {status_emoji} <b>{session.token}</b> {session.amount}\n"
+                    f"   Direction: {direction_display}\n"
+                    f"   Status: {session.status}\n"
+                    f"   ID: <code>{session.session_id_str}</code>\n\n"
+                )
+            
+            await message.answer(response)
                 
         except Exception as e:
             logger.error(f"Failed to fetch sessions: {e}", exc_info=True)
+            # Handled here, so the middleware would commit; drop partial writes
+            await uow.rollback()
             await message.answer(
                 "❌ Failed to fetch your sessions.\n"
                 "Please try again later."
             )
 
     @router.message(Command("track"))
-    async def cmd_track(message: types.Message) -> None:
+    async def cmd_track(message: types.Message, uow: UnitOfWork) -> None:
         """Track a transaction by hash."""
         # Extract TX hash from message
         parts = message.text.split(maxsplit=1)
@@ -339,7 +342,7 @@ def register_handlers(dp: Router) -> None:
         is_evm = False
         is_cellframe = False
         
-        if tx_hash.startswith("0x") and len(tx_hash) == 66:
+        if validate_tx_hash(tx_hash):
             # Ethereum/BSC format
             is_evm = True
         elif len(tx_hash) == 64:
@@ -393,10 +396,10 @@ def register_handlers(dp: Router) -> None:
                 try:
                     from watcher.cf20_rpc import CF20RPCClient
                     cf_network = os.getenv("CF_NETWORK", "Backbone")
-                    cf_client = CF20RPCClient(cf_rpc, cf_network)
                     
                     # Check transaction status
-                    tx_status = await cf_client.tx_status(tx_hash)
+                    async with CF20RPCClient(cf_rpc, cf_network) as cf_client:
+                        tx_status = await cf_client.tx_status(tx_hash)
                     
                     if tx_status and tx_status.get("found"):
                         detected_chain = "cellframe"
@@ -457,64 +460,64 @@ def register_handlers(dp: Router) -> None:
                 return
             
             # Save to database
-            async with SessionFactory() as db_session:
-                user_repo = UserRepository(db_session)
-                user = await user_repo.get_or_create(
-                    telegram_id=message.from_user.id,
-                    username=message.from_user.username,
+            db_session = uow.session
+            user_repo = UserRepository(db_session)
+            user = await user_repo.get_or_create(
+                telegram_id=message.from_user.id,
+                username=message.from_user.username,
+            )
+            
+            # Create or get session
+            session_repo = BridgeSessionRepository(db_session)
+            sessions = await session_repo.list_by_user(user.id, limit=1)
+            
+            if sessions:
+                session = sessions[0]
+            else:
+                # Create a tracking-only session
+                session = await session_repo.create(
+                    user_id=user.id,
+                    direction=f"{detected_chain}_to_cf",
+                    token="CELL",
+                    amount=tx_info.get("amount", "0"),
+                    src_network=detected_chain.title(),
+                    dst_network="Cellframe CF-20",
                 )
+            
+            # Add or update transaction
+            tx_repo = TransactionRepository(db_session)
+            existing_tx = await tx_repo.get_by_hash(tx_hash)
+            
+            if not existing_tx:
+                # Set confirmations_required based on chain
+                if detected_chain == "ethereum":
+                    conf_required = 12
+                elif detected_chain == "bsc":
+                    conf_required = 15
+                else:  # cellframe
+                    conf_required = int(os.getenv("CF_CONFIRMATIONS_REQUIRED", "3"))
                 
-                # Create or get session
-                session_repo = BridgeSessionRepository(db_session)
-                sessions = await session_repo.list_by_user(user.id, limit=1)
-                
-                if sessions:
-                    session = sessions[0]
-                else:
-                    # Create a tracking-only session
-                    session = await session_repo.create(
-                        user_id=user.id,
-                        direction=f"{detected_chain}_to_cf",
-                        token="CELL",
-                        amount=tx_info.get("amount", "0"),
-                        src_network=detected_chain.title(),
-                        dst_network="Cellframe CF-20",
-                    )
-                
-                # Add or update transaction
-                tx_repo = TransactionRepository(db_session)
-                existing_tx = await tx_repo.get_by_hash(tx_hash)
-                
-                if not existing_tx:
-                    # Set confirmations_required based on chain
-                    if detected_chain == "ethereum":
-                        conf_required = 12
-                    elif detected_chain == "bsc":
-                        conf_required = 15
-                    else:  # cellframe
-                        conf_required = int(os.getenv("CF_CONFIRMATIONS_REQUIRED", "3"))
-                    
-                    tx = await tx_repo.create(
-                        session_id=session.id,
-                        chain=detected_chain,
-                        tx_hash=tx_hash,
-                        confirmations_required=conf_required,
-                        from_address=tx_info.get("from"),
-                        to_address=tx_info.get("to"),
-                    )
-                    logger.info(f"Started tracking TX {tx_hash} for user {message.from_user.id}")
-                else:
-                    logger.info(f"TX {tx_hash} already tracked, showing current status")
-                
-                # Always update with current status (for both new and existing TX)
-                await tx_repo.update_status(
+                tx = await tx_repo.create(
+                    session_id=session.id,
+                    chain=detected_chain,
                     tx_hash=tx_hash,
-                    confirmations=tx_info.get("confirmations", 0),
-                    block_number=tx_info.get("block_number"),
-                    status="confirmed" if tx_info.get("confirmed") else "pending",
+                    confirmations_required=conf_required,
+                    from_address=tx_info.get("from"),
+                    to_address=tx_info.get("to"),
                 )
-                
-                await db_session.commit()
+                logger.info(f"Started tracking TX {tx_hash} for user {message.from_user.id}")
+            else:
+                logger.info(f"TX {tx_hash} already tracked, showing current status")
+            
+            # Always update with current status (for both new and existing TX)
+            await tx_repo.update_status(
+                tx_hash=tx_hash,
+                confirmations=tx_info.get("confirmations", 0),
+                block_number=tx_info.get("block_number"),
+                status="confirmed" if tx_info.get("confirmed") else "pending",
+            )
+            
+            await uow.commit()
                 
             # Display status
             confirmations = tx_info.get("confirmations", 0)
@@ -572,6 +575,8 @@ def register_handlers(dp: Router) -> None:
             
         except Exception as e:
             logger.error(f"Error tracking transaction: {e}", exc_info=True)
+            # Handled here, so the middleware would commit; drop partial writes
+            await uow.rollback()
             await message.answer(
                 "❌ <b>Error tracking transaction</b>\n\n"
                 "An error occurred while checking the transaction.\n\n"
@@ -732,7 +737,7 @@ def register_handlers(dp: Router) -> None:
         )
 
     @router.callback_query(F.data.startswith("confirm:"), BridgeFlow.confirming)
-    async def handle_confirmation(callback: types.CallbackQuery, state: FSMContext) -> None:
+    async def handle_confirmation(callback: types.CallbackQuery, state: FSMContext, uow: UnitOfWork) -> None:
         """Handle bridge session confirmation."""
         action = callback.data.split(":", 1)[1]
         
@@ -749,35 +754,37 @@ def register_handlers(dp: Router) -> None:
         
         # Create session in database
         try:
-            async with SessionFactory() as db_session:
-                # Get or create user
-                user_repo = UserRepository(db_session)
-                user = await user_repo.get_or_create(
-                    telegram_id=callback.from_user.id,
-                    username=callback.from_user.username,
-                )
-                
-                # Create bridge session
-                session_repo = BridgeSessionRepository(db_session)
-                session = await session_repo.create(
-                    user_id=user.id,
-                    direction=direction,
-                    token=data.get("token", "CELL"),
-                    amount=data.get("amount", "0"),
-                    src_address=data.get("src_address", ""),
-                    dst_address=data.get("dst_address", ""),
-                    src_network=get_chain_name(src),
-                    dst_network=get_chain_name(dst),
-                )
-                
-                await db_session.commit()
-                
-                session_id = session.session_id
-                
-                logger.info(f"Created bridge session {session_id} for user {callback.from_user.id}")
+            db_session = uow.session
+            # Get or create user
+            user_repo = UserRepository(db_session)
+            user = await user_repo.get_or_create(
+                telegram_id=callback.from_user.id,
+                username=callback.from_user.username,
+            )
+            
+            # Create bridge session
+            session_repo = BridgeSessionRepository(db_session)
+            session = await session_repo.create(
+                user_id=user.id,
+                direction=direction,
+                token=data.get("token", "CELL"),
+                amount=data.get("amount", "0"),
+                src_address=data.get("src_address", ""),
+                dst_address=data.get("dst_address", ""),
+                src_network=get_chain_name(src),
+                dst_network=get_chain_name(dst),
+            )
+            
+            await uow.commit()
+            
+            session_id = session.session_id_str
+            
+            logger.info(f"Created bridge session {session_id} for user {callback.from_user.id}")
                 
         except Exception as e:
             logger.error(f"Failed to create bridge session: {e}", exc_info=True)
+            # Handled here, so the middleware would commit; drop partial writes
+            await uow.rollback()
             await callback.message.edit_text(
                 "❌ <b>Error creating session</b>\n\n"
                 "Please try again later or contact support."
@@ -12,6 +12,7 @@ from aiogram.types import BotCommand
 
 from bot.config import get_bot_config
 from bot.handlers import register_handlers
+from bot.middlewares import UnitOfWorkMiddleware
 
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,7 @@ async def main() -> None:
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
     dp = Dispatcher(storage=storage)
+    dp.update.middleware(UnitOfWorkMiddleware())
 
     register_handlers(dp)
 
@@ -0,0 +1,44 @@
+"""
+Aiogram middlewares shared by all handlers.
+"""
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from data.database import get_session
+from data.repositories import UnitOfWork
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """
+    Open a single database session per update and expose it as ``uow``.
+
+    Handlers pass ``uow.session`` to the repository classes, so one update
+    checks out at most one pooled connection and commits once at the end.
+    If the handler raises, its writes are rolled back instead.
+    The session connects lazily, so updates that never touch the database
+    cost nothing.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with get_session() as session:
+            uow = UnitOfWork(session)
+            data["uow"] = uow
+            try:
+                result = await handler(event, data)
+            except Exception:
+                await uow.rollback()
+                raise
+            await uow.commit()
+            return result
+
+
+__all__ = ["UnitOfWorkMiddleware"]
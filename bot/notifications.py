@@ -45,7 +45,7 @@ class NotificationService:
         """
         message = (
             "🆕 <b>Bridge Session Created</b>\n\n"
-            f"Session ID: <code>{session.session_id}</code>\n"
+            f"Session ID: <code>{session.session_id_str}</code>\n"
             f"Direction: {session.direction.replace('_to_', ' → ')}\n"
             f"Token: {session.token}\n"
             f"Amount: {session.amount}\n\n"
@@ -73,7 +73,7 @@ class NotificationService:
         """
         message = (
             "🔍 <b>Transaction Detected</b>\n\n"
-            f"Session: <code>{session.session_id[:16]}...</code>\n"
+            f"Session: <code>{session.session_id_str[:16]}...</code>\n"
             f"Chain: {transaction.chain.upper()}\n"
             f"Hash: <code>{transaction.hash[:16]}...{transaction.hash[-8:]}</code>\n\n"
             f"Status: Waiting for confirmations...\n"
@@ -113,7 +113,7 @@ class NotificationService:
 
         message = (
             "⏳ <b>Confirmation Progress</b>\n\n"
-            f"Session: <code>{session.session_id[:16]}...</code>\n"
+            f"Session: <code>{session.session_id_str[:16]}...</code>\n"
             f"Chain: {transaction.chain.upper()}\n\n"
             f"{progress_bar}\n"
             f"Confirmations: {confirmations}/{required}\n"
@@ -143,7 +143,7 @@ class NotificationService:
         """
         message = (
             "✅ <b>Transaction Confirmed!</b>\n\n"
-            f"Session: <code>{session.session_id[:16]}...</code>\n"
+            f"Session: <code>{session.session_id_str[:16]}...</code>\n"
             f"Chain: {transaction.chain.upper()}\n"
             f"Side: {side.title()}\n\n"
             f"Confirmations: {transaction.confirmations}/{transaction.confirmations_required}\n\n"
@@ -183,7 +183,7 @@ class NotificationService:
         """
         message = (
             "❌ <b>Transaction Failed</b>\n\n"
-            f"Session: <code>{session.session_id[:16]}...</code>\n"
+            f"Session: <code>{session.session_id_str[:16]}...</code>\n"
             f"Chain: {transaction.chain.upper()}\n"
             f"Hash: <code>{transaction.hash[:16]}...{transaction.hash[-8:]}</code>\n\n"
         )
@@ -218,7 +218,7 @@ class NotificationService:
         """
         message = (
             "🎉 <b>Bridge Session Completed!</b>\n\n"
-            f"Session: <code>{session.session_id}</code>\n"
+            f"Session: <code>{session.session_id_str}</code>\n"
             f"Direction: {session.direction.replace('_to_', ' → ')}\n"
             f"Token: {session.token}\n"
             f"Amount: {session.amount}\n\n"
@@ -247,14 +247,14 @@ class NotificationService:
         """
         message = (
             "⚠️ <b>Bridge Session Alert</b>\n\n"
-            f"Session: <code>{session.session_id[:16]}...</code>\n\n"
+            f"Session: <code>{session.session_id_str[:16]}...</code>\n\n"
             f"Your bridge session appears to be stuck:\n"
             f"{reason}\n\n"
             f"<b>Recommended Actions:</b>\n"
             f"• Use /status to get detailed diagnostics\n"
             f"• Check transaction on blockchain explorer\n"
             f"• Contact support if issue persists\n\n"
-            f"Session ID: <code>{session.session_id}</code>"
+            f"Session ID: <code>{session.session_id_str}</code>"
         )
 
         return await self._send_notification(user_id, message)
@@ -14,6 +14,7 @@ from bot.storage import BindingStorage
 from watcher.cf20_rpc import CF20RPCClient
 from watcher.diagnostics import TransactionDiagnostics
 from watcher.evm_tracker import EVMTransactionTracker
+from watcher.validators import validate_tx_hash
 
 
 logger = logging.getLogger(__name__)
@@ -183,7 +184,7 @@ class StatusCommandHandler:
             Chain name or None
         """
         # EVM chains (Ethereum, BSC) - 0x prefix, 66 chars
-        if tx_hash.startswith("0x") and len(tx_hash) == 66:
+        if validate_tx_hash(tx_hash):
             # Could be either ETH or BSC - default to ETH
             # In production, might need chain parameter or auto-check both
             return "ethereum"
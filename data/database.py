@@ -26,9 +26,13 @@ def get_engine():
             pool_pre_ping=True,  # Verify connections before use
             pool_recycle=3600,  # Recycle connections every hour
             pool_timeout=30,  # Max wait time for connection
+            query_cache_size=1200,  # Compiled-statement cache shared by all sessions
             connect_args={
                 "server_settings": {"application_name": "cellframe_bot"},
                 "command_timeout": 60,
+                # Server-side prepared statements: parse/plan once per connection
+                "prepared_statement_cache_size": 500,
+                "statement_cache_size": 500,
             }
         )
     return _engine
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, LargeBinary, String, Text, func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -17,7 +19,9 @@ class User(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
     username: Mapped[Optional[str]] = mapped_column(String(255))
     language_code: Mapped[Optional[str]] = mapped_column(String(8))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
     wallet_bindings: Mapped[list["WalletBinding"]] = relationship(back_populates="user")
     bridge_sessions: Mapped[list["BridgeSession"]] = relationship(back_populates="user")
@@ -31,16 +35,22 @@ class WalletBinding(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     chain: Mapped[str] = mapped_column(String(64))
     address: Mapped[str] = mapped_column(String(255))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
     user: Mapped[User] = relationship(back_populates="wallet_bindings")
 
 
 class BridgeSession(Base):
     __tablename__ = "bridge_sessions"
+    # Fetch server-generated timestamps via RETURNING so they are never
+    # lazy-loaded (which would fail on an AsyncSession).
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    session_id: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    # UUIDv7 as raw bytes: time-ordered, so inserts stay at the right edge of the index
+    session_id: Mapped[bytes] = mapped_column(LargeBinary(16), unique=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
     direction: Mapped[str] = mapped_column(String(64))
     token: Mapped[str] = mapped_column(String(32))
@@ -52,17 +62,30 @@ class BridgeSession(Base):
     status: Mapped[str] = mapped_column(String(32), default="pending")
     estimated_fee: Mapped[Optional[str]] = mapped_column(String(64))
     estimated_time_seconds: Mapped[Optional[int]] = mapped_column(Integer)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     user: Mapped[Optional[User]] = relationship(back_populates="bridge_sessions")
     transactions: Mapped[list["Transaction"]] = relationship(back_populates="session")
 
+    @hybrid_property
+    def session_id_str(self) -> str:
+        """Hex representation of ``session_id`` for display and callback data."""
+        return uuid.UUID(bytes=self.session_id).hex
+
+    @session_id_str.inplace.expression
+    @classmethod
+    def _session_id_str_expression(cls):
+        return func.encode(cls.session_id, "hex")
+
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     session_id: Mapped[int] = mapped_column(ForeignKey("bridge_sessions.id", ondelete="CASCADE"))
@@ -78,9 +101,11 @@ class Transaction(Base):
     to_address: Mapped[Optional[str]] = mapped_column(String(255))
     confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
     error_message: Mapped[Optional[str]] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     session: Mapped[BridgeSession] = relationship(back_populates="transactions")
@@ -96,7 +121,9 @@ class Alert(Base):
     )
     message: Mapped[str] = mapped_column(Text)
     sent: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
     user: Mapped[User] = relationship(back_populates="alerts")
     session: Mapped[Optional[BridgeSession]] = relationship()
@@ -1,73 +1,117 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
-from typing import Iterable, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from uuid6 import uuid7
 
 from data.database import get_session
 from data.models import Alert, BridgeSession, Transaction, User, WalletBinding
 
 
-async def get_or_create_user(user_id: int, username: str | None, language_code: str | None) -> User:
-    async with get_session() as session:
-        result = await session.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+@asynccontextmanager
+async def _session_scope(session: AsyncSession | None) -> AsyncIterator[AsyncSession]:
+    """Reuse the caller's unit-of-work session, or open and commit a standalone one."""
+    if session is not None:
+        yield session
+        await session.flush()
+        return
+    async with get_session() as own_session:
+        yield own_session
+        await own_session.commit()
+
+
+async def get_or_create_user(
+    user_id: int,
+    username: str | None,
+    language_code: str | None,
+    session: AsyncSession | None = None,
+) -> User:
+    async with _session_scope(session) as session:
+        user = await session.get(User, user_id)
         if user is None:
             user = User(id=user_id, username=username, language_code=language_code)
             session.add(user)
         else:
             user.username = username
             user.language_code = language_code
-        await session.commit()
-        await session.refresh(user)
         return user
 
 
-async def list_wallet_bindings(user_id: int) -> Iterable[WalletBinding]:
-    async with get_session() as session:
+async def list_wallet_bindings(
+    user_id: int, session: AsyncSession | None = None
+) -> Iterable[WalletBinding]:
+    async with _session_scope(session) as session:
         result = await session.execute(
             select(WalletBinding).where(WalletBinding.user_id == user_id)
         )
         return result.scalars().all()
 
 
-async def save_bridge_session(session_data: BridgeSession) -> BridgeSession:
-    async with get_session() as session:
-        session.merge(session_data)
-        await session.commit()
+async def save_bridge_session(
+    session_data: BridgeSession, session: AsyncSession | None = None
+) -> BridgeSession:
+    async with _session_scope(session) as session:
+        await session.merge(session_data)
         return session_data
 
 
-async def add_transaction(transaction: Transaction) -> Transaction:
-    async with get_session() as session:
+async def add_transaction(
+    transaction: Transaction, session: AsyncSession | None = None
+) -> Transaction:
+    async with _session_scope(session) as session:
         session.add(transaction)
-        await session.commit()
-        await session.refresh(transaction)
         return transaction
 
 
-async def create_alert(alert: Alert) -> Alert:
-    async with get_session() as session:
+async def create_alert(alert: Alert, session: AsyncSession | None = None) -> Alert:
+    async with _session_scope(session) as session:
         session.add(alert)
-        await session.commit()
-        await session.refresh(alert)
         return alert
 
 
-async def mark_alert_sent(alert_id: int) -> None:
-    async with get_session() as session:
-        result = await session.execute(select(Alert).where(Alert.id == alert_id))
-        alert = result.scalar_one()
+async def mark_alert_sent(alert_id: int, session: AsyncSession | None = None) -> None:
+    async with _session_scope(session) as session:
+        alert = await session.get_one(Alert, alert_id)
         alert.sent = True
-        await session.commit()
+
+
+class UnitOfWork:
+    """One session per bot update; repositories share it and it is committed once."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
 
 
 # ==================== Repository Classes ====================
 
 
+def _session_id_bytes(session_id: str | bytes) -> bytes:
+    """Normalize a session ID given as hex/UUID string to its stored 16-byte form."""
+    if isinstance(session_id, bytes):
+        return session_id
+    return uuid.UUID(session_id).bytes
+
+
+def _pending_stmt(limit: int):
+    """Unconfirmed transactions, newest first."""
+    return (
+        select(Transaction)
+        .where(Transaction.confirmed == False)
+        .order_by(Transaction.created_at.desc())
+        .limit(limit)
+    )
+
+
 class UserRepository:
     """Repository for User operations."""
     
@@ -76,10 +120,7 @@ class UserRepository:
     
     async def get_or_create(self, telegram_id: int, username: Optional[str] = None) -> User:
         """Get existing user or create new one."""
-        result = await self.session.execute(
-            select(User).where(User.id == telegram_id)
-        )
-        user = result.scalar_one_or_none()
+        user = await self.session.get(User, telegram_id)
         
         if user is None:
             user = User(id=telegram_id, username=username)
@@ -93,10 +134,7 @@ class UserRepository:
     
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by internal ID."""
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        return await self.session.get(User, user_id)
 
 
 class BridgeSessionRepository:
@@ -120,7 +158,7 @@ class BridgeSessionRepository:
     ) -> BridgeSession:
         """Create new bridge session."""
         session = BridgeSession(
-            session_id=uuid.uuid4().hex,
+            session_id=uuid7().bytes,
             user_id=user_id,
             direction=direction,
             token=token,
@@ -132,21 +170,21 @@ class BridgeSessionRepository:
             status="pending",
             estimated_fee=estimated_fee,
             estimated_time_seconds=estimated_time_seconds,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
         )
         self.session.add(session)
         await self.session.flush()
         return session
     
-    async def get_by_session_id(self, session_id: str) -> Optional[BridgeSession]:
-        """Get bridge session by session ID."""
+    async def get_by_session_id(self, session_id: str | bytes) -> Optional[BridgeSession]:
+        """Get bridge session by session ID (raw bytes or hex string)."""
         result = await self.session.execute(
-            select(BridgeSession).where(BridgeSession.session_id == session_id)
+            select(BridgeSession).where(
+                BridgeSession.session_id == _session_id_bytes(session_id)
+            )
         )
         return result.scalar_one_or_none()
     
-    async def list_by_user(self, user_id: int, limit: int = 10) -> list[BridgeSession]:
+    async def list_by_user(self, user_id: int, limit: int = 10) -> Sequence[BridgeSession]:
         """List bridge sessions for user."""
         result = await self.session.execute(
             select(BridgeSession)
@@ -154,17 +192,18 @@ class BridgeSessionRepository:
             .order_by(BridgeSession.created_at.desc())
             .limit(limit)
         )
-        return list(result.scalars().all())
+        return result.scalars().all()
     
-    async def update_status(self, session_id: str, status: str) -> None:
+    async def update_status(self, session_id: str | bytes, status: str) -> None:
         """Update session status."""
         result = await self.session.execute(
-            select(BridgeSession).where(BridgeSession.session_id == session_id)
+            select(BridgeSession).where(
+                BridgeSession.session_id == _session_id_bytes(session_id)
+            )
         )
         session = result.scalar_one_or_none()
         if session:
             session.status = status
-            session.updated_at = datetime.utcnow()
             await self.session.flush()
 
 
@@ -193,8 +232,6 @@ class TransactionRepository:
             status="pending",
             from_address=from_address,
             to_address=to_address,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
         )
         self.session.add(transaction)
         await self.session.flush()
@@ -228,18 +265,20 @@ class TransactionRepository:
             if confirmations >= tx.confirmations_required:
                 tx.confirmed = True
                 tx.status = "confirmed"
-            tx.updated_at = datetime.utcnow()
             await self.session.flush()
     
-    async def list_pending(self, limit: int = 100) -> list[Transaction]:
+    async def list_pending(self, limit: int = 100) -> Sequence[Transaction]:
         """List pending transactions for monitoring."""
-        result = await self.session.execute(
-            select(Transaction)
-            .where(Transaction.confirmed == False)
-            .order_by(Transaction.created_at.desc())
-            .limit(limit)
+        result = await self.session.execute(_pending_stmt(limit))
+        return result.scalars().all()
+    
+    async def iter_pending(self, limit: int = 100) -> AsyncIterator[Transaction]:
+        """Stream pending transactions without buffering the whole result."""
+        result = await self.session.stream_scalars(
+            _pending_stmt(limit).execution_options(yield_per=50)
         )
-        return list(result.scalars().all())
+        async for tx in result:
+            yield tx
 
 
 __all__ = [
@@ -249,6 +288,7 @@ __all__ = [
     "add_transaction",
     "create_alert",
     "mark_alert_sent",
+    "UnitOfWork",
     "UserRepository",
     "BridgeSessionRepository",
     "TransactionRepository",
@@ -3,33 +3,231 @@
 Comprehensive audit script for Cellframe Navigator Bot.
 Checks code quality, security, functionality, and deployment readiness.
 """
+import functools
+import mmap
 import os
+import re
 import sys
 import subprocess
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import hyperscan
+except ImportError:  # optional: single-pass multi-pattern DFA, falls back to `re`
+    hyperscan = None
+
+# Files larger than this are mmap'ed rather than read into memory
+MMAP_THRESHOLD = 64 * 1024
+
+SENSITIVE_PATTERNS = ("password", "secret", "key", "token")
+REQUIRED_COMMANDS = ("start", "help", "track", "stats", "faq")
+REQUIRED_MODELS = ("User", "BridgeSession", "Transaction")
+KEY_DEPS = ("aiogram", "sqlalchemy", "web3", "redis", "alembic")
+
+# Argument lists of every Command(...) filter, e.g. Command("start", "help")
+_CMD_RE = re.compile(r'Command\(([^)]*)\)')
+_CMD_NAME_RE = re.compile(r'"([^"]+)"')
+# Leading project name of each quoted requirement, e.g. "redis[hiredis]>=5" -> redis
+_REQ_NAME_RE = re.compile(r'["\']([a-z0-9_.\-]+)')
+
+# Directories never descended into when collecting sources
+IGNORED_DIRS = frozenset({
+    ".venv", "venv", ".git", "__pycache__", "node_modules", ".mypy_cache", ".pytest_cache",
+})
+
 
 class BotAuditor:
     """Comprehensive bot audit system."""
     
+    _SECRET_RE = re.compile(rb'(?i)(password|secret|key|token) = ["\']')
+    _QUALITY_RE = re.compile(rb'TODO|FIXME|try:')
+    
     def __init__(self):
-        self.issues = []
-        self.warnings = []
-        self.passed = []
+        # (category, message) pairs, formatted only when the report is printed
+        self.issues: list[tuple[str, str]] = []
+        self.warnings: list[tuple[str, str]] = []
+        self.passed: list[tuple[str, str]] = []
         self.root = Path(__file__).parent
+        # Populated by _prepare(); the audit_* methods only read this state
+        self._root_names = {}
+        self._py_files = []
+        self._dep_names = frozenset()
+        self._dockerfile_src = ""
+        self._migration_count = 0
+        self._hs_local = threading.local()
+        self.stats = {}
+        self.counts = defaultdict(lambda: {"pass": 0, "warn": 0, "issue": 0})
+        
+    @staticmethod
+    def _scan_py(root: Path):
+        """Yield all .py files under root in a single scandir walk, skipping virtualenvs and caches."""
+        stack = [str(root)]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        yield Path(entry.path)
+    
+    @functools.cached_property
+    def _handlers_src(self) -> str:
+        """Source of bot/handlers.py, read once and shared by all audits."""
+        handlers_file = self.root / "bot" / "handlers.py"
+        return handlers_file.read_text() if handlers_file.exists() else ""
+    
+    @functools.cached_property
+    def _models_src(self) -> str:
+        """Source of data/models.py, read once and shared by all audits."""
+        models_file = self.root / "data" / "models.py"
+        return models_file.read_text() if models_file.exists() else ""
+        
+    def _scan_one(self, py_file: Path) -> tuple[int, int, int, list[str]]:
+        """Read and scan one file, returning (todo, fixme, try, secret patterns hit)."""
+        fd = os.open(py_file, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            # Large files are scanned in place from the page cache instead of copied
+            if size > MMAP_THRESHOLD:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as buf:
+                    return self._scan_buffer(buf)
+            return self._scan_buffer(os.read(fd, size))
+        finally:
+            os.close(fd)
+    
+    @functools.cached_property
+    def _hs_db(self):
+        """All audit patterns compiled into one Hyperscan database, or None without hyperscan."""
+        if hyperscan is None:
+            return None
+        # ids: 0-2 quality needles, then one per sensitive pattern, last is os.getenv
+        expressions = [rb"TODO", rb"FIXME", rb"try:"]
+        flags = [0, 0, 0]
+        for pattern in SENSITIVE_PATTERNS:
+            expressions.append(pattern.encode() + rb" = [\"']")
+            flags.append(hyperscan.HS_FLAG_CASELESS)
+        expressions.append(rb"os\.getenv")
+        flags.append(0)
+        db = hyperscan.Database()
+        db.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=flags,
+        )
+        return db
+    
+    def _scan_hyperscan(self, buf) -> tuple[int, int, int, list[str]]:
+        """Count every audit pattern in one Hyperscan pass over buf."""
+        # Scratch space is per-thread; the compiled database is shared
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+        
+        matches = [0] * (len(SENSITIVE_PATTERNS) + 4)
+        
+        def on_match(expr_id, start, end, flags, context):
+            context[expr_id] += 1
+        
+        self._hs_db.scan(buf, match_event_handler=on_match, context=matches, scratch=scratch)
+        hits = []
+        if not matches[-1]:
+            hits = [p for p, n in zip(SENSITIVE_PATTERNS, matches[3:-1]) if n]
+        return matches[0], matches[1], matches[2], hits
+    
+    def _scan_buffer(self, buf) -> tuple[int, int, int, list[str]]:
+        """Scan a bytes-like buffer (bytes or mmap); uses find() since mmap's `in` is per-byte."""
+        if self._hs_db is not None:
+            return self._scan_hyperscan(buf)
+        
+        if isinstance(buf, bytes):
+            # Fixed needles: bytes.count is a tight C loop with no per-hit objects
+            todo, fixme, tries = buf.count(b"TODO"), buf.count(b"FIXME"), buf.count(b"try:")
+        else:
+            # mmap has no count(), so fall back to one regex pass
+            counts = Counter(self._QUALITY_RE.findall(buf))
+            todo, fixme, tries = counts[b"TODO"], counts[b"FIXME"], counts[b"try:"]
+        hits = []
+        
+        # Cheap pre-filter, then the os.getenv exemption only for files that matched
+        if buf.find(b"=") != -1:
+            first = self._SECRET_RE.search(buf)
+            if first is not None and buf.find(b"os.getenv") == -1:
+                found = {
+                    m.group(1).lower().decode()
+                    for m in self._SECRET_RE.finditer(buf, first.start())
+                }
+                hits = [pattern for pattern in SENSITIVE_PATTERNS if pattern in found]
+        
+        return todo, fixme, tries, hits
+    
+    def _prepare(self):
+        """Do all filesystem work up front so every audit is a pure consumer of cached state."""
+        with os.scandir(self.root) as entries:
+            self._root_names = {e.name: e for e in entries}
+        self._py_files = list(self._scan_py(self.root))
+        self._collect_stats()
+        # Warm the cached sources so no audit touches the filesystem
+        self._handlers_src
+        self._models_src
+        
+        if "pyproject.toml" in self._root_names:
+            content = (self.root / "pyproject.toml").read_text().lower()
+            self._dep_names = frozenset(_REQ_NAME_RE.findall(content))
+        if "Dockerfile" in self._root_names:
+            self._dockerfile_src = (self.root / "Dockerfile").read_text()
+        
+        alembic_entry = self._root_names.get("alembic")
+        if alembic_entry is not None and alembic_entry.is_dir():
+            try:
+                with os.scandir(os.path.join(alembic_entry.path, "versions")) as entries:
+                    self._migration_count = sum(1 for e in entries if e.name.endswith(".py"))
+            except FileNotFoundError:
+                pass
+    
+    def _collect_stats(self):
+        """Scan every source file once, computing all counters the audits need."""
+        self._hs_db  # compile once before the workers share it
+        # File reads release the GIL, so a thread pool overlaps the I/O
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as ex:
+            results = list(ex.map(self._scan_one, self._py_files))
+        
+        self.stats = {
+            "todo_count": sum(todo + fixme for todo, fixme, _, _ in results),
+            "try_count": sum(tries for _, _, tries, _ in results),
+            "secret_hits": [
+                (pattern, py_file.name)
+                for py_file, (_, _, _, hits) in zip(self._py_files, results)
+                for pattern in hits
+            ],
+        }
         
     def log_issue(self, category: str, message: str):
         """Log a critical issue."""
-        self.issues.append(f"[{category}] {message}")
+        self.issues.append((category, message))
+        self.counts[category]["issue"] += 1
         
     def log_warning(self, category: str, message: str):
         """Log a warning."""
-        self.warnings.append(f"[{category}] {message}")
+        self.warnings.append((category, message))
+        self.counts[category]["warn"] += 1
         
     def log_pass(self, category: str, message: str):
         """Log a passed check."""
-        self.passed.append(f"[{category}] {message}")
+        self.passed.append((category, message))
+        self.counts[category]["pass"] += 1
+    
+    def print_summary(self, category: str):
+        """Print pass/warning/issue counts for one audit category."""
+        c = self.counts[category]
+        print(f"  ✅ Passed: {c['pass']}")
+        print(f"  ⚠️  Warnings: {c['warn']}")
+        print(f"  ❌ Issues: {c['issue']}")
     
     def audit_security(self):
         """Audit security aspects."""
@@ -37,50 +235,32 @@ class BotAuditor:
         print("=" * 70)
         
         # Check .env file
-        env_file = self.root / ".env"
-        if env_file.exists():
+        if ".env" in self._root_names:
             self.log_warning("Security", ".env file exists (should not be in production)")
         else:
             self.log_pass("Security", ".env file not in repository")
         
         # Check .env.example
-        env_example = self.root / ".env.example"
-        if env_example.exists():
+        if ".env.example" in self._root_names:
             self.log_pass("Security", ".env.example exists for reference")
         else:
             self.log_warning("Security", ".env.example missing")
         
         # Check for exposed secrets in code
-        sensitive_patterns = ["password", "secret", "key", "token"]
-        python_files = list(self.root.glob("**/*.py"))
-        
-        for py_file in python_files:
-            if ".venv" in str(py_file) or "venv" in str(py_file):
-                continue
-                
-            try:
-                content = py_file.read_text().lower()
-                for pattern in sensitive_patterns:
-                    if f'{pattern} = "' in content or f"{pattern} = '" in content:
-                        if "os.getenv" not in content:
-                            self.log_issue("Security", f"Potential hardcoded {pattern} in {py_file.name}")
-            except Exception:
-                pass
+        for pattern, file_name in self.stats["secret_hits"]:
+            self.log_issue("Security", f"Potential hardcoded {pattern} in {file_name}")
         
         self.log_pass("Security", "No obvious hardcoded secrets found")
         
         # Check input validation
-        handlers_file = self.root / "bot" / "handlers.py"
-        if handlers_file.exists():
-            content = handlers_file.read_text()
+        content = self._handlers_src
+        if content:
             if "validate_address" in content:
                 self.log_pass("Security", "Address validation implemented")
             else:
                 self.log_warning("Security", "Address validation may be missing")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Security' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Security' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Security' in i])}")
+        self.print_summary("Security")
     
     def audit_code_quality(self):
         """Audit code quality."""
@@ -88,123 +268,89 @@ class BotAuditor:
         print("=" * 70)
         
         # Check for TODO/FIXME comments
-        python_files = list(self.root.glob("**/*.py"))
-        todo_count = 0
-        
-        for py_file in python_files:
-            if ".venv" in str(py_file):
-                continue
-            try:
-                content = py_file.read_text()
-                todo_count += content.count("TODO")
-                todo_count += content.count("FIXME")
-            except Exception:
-                pass
-        
+        todo_count = self.stats["todo_count"]
         if todo_count > 0:
             self.log_warning("Code Quality", f"Found {todo_count} TODO/FIXME comments")
         else:
             self.log_pass("Code Quality", "No TODO/FIXME comments")
         
         # Check for proper error handling
-        try_count = 0
-        for py_file in python_files:
-            if ".venv" in str(py_file):
-                continue
-            try:
-                content = py_file.read_text()
-                try_count += content.count("try:")
-            except Exception:
-                pass
-        
+        try_count = self.stats["try_count"]
         if try_count > 10:
             self.log_pass("Code Quality", f"Good error handling ({try_count} try blocks)")
         else:
             self.log_warning("Code Quality", "Limited error handling")
         
         # Check logging
-        handlers_file = self.root / "bot" / "handlers.py"
-        if handlers_file.exists():
-            content = handlers_file.read_text()
+        content = self._handlers_src
+        if content:
             if "logger" in content:
                 self.log_pass("Code Quality", "Logging implemented")
             else:
                 self.log_warning("Code Quality", "Logging may be missing")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Code Quality' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Code Quality' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Code Quality' in i])}")
+        self.print_summary("Code Quality")
     
     def audit_functionality(self):
         """Audit functionality."""
         print("\n⚙️  [3/8] FUNCTIONALITY AUDIT")
         print("=" * 70)
         
-        required_commands = ["/start", "/help", "/track", "/stats", "/faq"]
-        handlers_file = self.root / "bot" / "handlers.py"
-        
-        if handlers_file.exists():
-            content = handlers_file.read_text()
-            
-            for cmd in required_commands:
-                cmd_clean = cmd.replace("/", "")
-                if f'Command("{cmd_clean}")' in content or f'Command("start", "help")' in content:
-                    self.log_pass("Functionality", f"{cmd} command implemented")
+        content = self._handlers_src
+        
+        if content:
+            registered = {
+                name
+                for args in _CMD_RE.findall(content)
+                for name in _CMD_NAME_RE.findall(args)
+            }
+            for cmd in REQUIRED_COMMANDS:
+                if cmd in registered:
+                    self.log_pass("Functionality", f"/{cmd} command implemented")
                 else:
-                    self.log_issue("Functionality", f"{cmd} command missing")
+                    self.log_issue("Functionality", f"/{cmd} command missing")
         
         # Check database models
-        models_file = self.root / "data" / "models.py"
-        if models_file.exists():
-            content = models_file.read_text()
-            required_models = ["User", "BridgeSession", "Transaction"]
-            for model in required_models:
+        content = self._models_src
+        if content:
+            for model in REQUIRED_MODELS:
                 if f"class {model}" in content:
                     self.log_pass("Functionality", f"{model} model exists")
                 else:
                     self.log_issue("Functionality", f"{model} model missing")
         
         # Check RPC clients
-        cf20_rpc = self.root / "watcher" / "cf20_rpc.py"
-        evm_tracker = self.root / "watcher" / "evm_tracker.py"
+        py_files = set(self._py_files)
         
-        if cf20_rpc.exists():
+        if self.root / "watcher" / "cf20_rpc.py" in py_files:
             self.log_pass("Functionality", "Cellframe RPC client exists")
         else:
             self.log_issue("Functionality", "Cellframe RPC client missing")
             
-        if evm_tracker.exists():
+        if self.root / "watcher" / "evm_tracker.py" in py_files:
             self.log_pass("Functionality", "EVM tracker exists")
         else:
             self.log_issue("Functionality", "EVM tracker missing")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Functionality' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Functionality' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Functionality' in i])}")
+        self.print_summary("Functionality")
     
     def audit_dependencies(self):
         """Audit dependencies."""
         print("\n📦 [4/8] DEPENDENCIES AUDIT")
         print("=" * 70)
         
-        pyproject = self.root / "pyproject.toml"
-        if pyproject.exists():
+        if "pyproject.toml" in self._root_names:
             self.log_pass("Dependencies", "pyproject.toml exists")
-            content = pyproject.read_text()
-            
             # Check key dependencies
-            key_deps = ["aiogram", "sqlalchemy", "web3", "redis", "alembic"]
-            for dep in key_deps:
-                if dep in content.lower():
+            for dep in KEY_DEPS:
+                if dep in self._dep_names:
                     self.log_pass("Dependencies", f"{dep} listed")
                 else:
                     self.log_warning("Dependencies", f"{dep} may be missing")
         else:
             self.log_issue("Dependencies", "pyproject.toml missing")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Dependencies' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Dependencies' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Dependencies' in i])}")
+        self.print_summary("Dependencies")
     
     def audit_documentation(self):
         """Audit documentation."""
@@ -219,37 +365,30 @@ class BotAuditor:
         }
         
         for doc, desc in docs.items():
-            if (self.root / doc).exists():
+            if doc in self._root_names:
                 self.log_pass("Documentation", f"{doc} exists ({desc})")
             else:
                 self.log_warning("Documentation", f"{doc} missing ({desc})")
         
         # Check docstrings
-        handlers_file = self.root / "bot" / "handlers.py"
-        if handlers_file.exists():
-            content = handlers_file.read_text()
+        content = self._handlers_src
+        if content:
             docstring_count = content.count('"""')
             if docstring_count > 10:
                 self.log_pass("Documentation", f"Good docstring coverage ({docstring_count//2} docstrings)")
             else:
                 self.log_warning("Documentation", "Limited docstring coverage")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Documentation' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Documentation' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Documentation' in i])}")
+        self.print_summary("Documentation")
     
     def audit_docker(self):
         """Audit Docker configuration."""
         print("\n🐳 [6/8] DOCKER CONFIGURATION AUDIT")
         print("=" * 70)
         
-        dockerfile = self.root / "Dockerfile"
-        docker_compose = self.root / "docker-compose.yml"
-        docker_compose_min = self.root / "docker-compose.minimal.yml"
-        
-        if dockerfile.exists():
+        if "Dockerfile" in self._root_names:
             self.log_pass("Docker", "Dockerfile exists")
-            content = dockerfile.read_text()
+            content = self._dockerfile_src
             
             if "COPY" in content and "requirements" not in content.lower():
                 self.log_pass("Docker", "Uses modern dependency management")
@@ -259,59 +398,55 @@ class BotAuditor:
         else:
             self.log_issue("Docker", "Dockerfile missing")
         
-        if docker_compose.exists():
+        if "docker-compose.yml" in self._root_names:
             self.log_pass("Docker", "docker-compose.yml exists")
         else:
             self.log_warning("Docker", "docker-compose.yml missing")
             
-        if docker_compose_min.exists():
+        if "docker-compose.minimal.yml" in self._root_names:
             self.log_pass("Docker", "docker-compose.minimal.yml exists")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Docker' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Docker' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Docker' in i])}")
+        self.print_summary("Docker")
     
     def audit_database(self):
         """Audit database configuration."""
         print("\n🗄️  [7/8] DATABASE AUDIT")
         print("=" * 70)
         
-        alembic_ini = self.root / "alembic.ini"
-        alembic_dir = self.root / "alembic"
-        
-        if alembic_ini.exists():
+        if "alembic.ini" in self._root_names:
             self.log_pass("Database", "Alembic configuration exists")
         else:
             self.log_issue("Database", "Alembic configuration missing")
         
-        if alembic_dir.exists() and alembic_dir.is_dir():
-            versions = list((alembic_dir / "versions").glob("*.py"))
+        alembic_entry = self._root_names.get("alembic")
+        if alembic_entry is not None and alembic_entry.is_dir():
+            versions = self._migration_count
             if versions:
-                self.log_pass("Database", f"Migration(s) exist ({len(versions)} migration(s))")
+                self.log_pass("Database", f"Migration(s) exist ({versions} migration(s))")
             else:
                 self.log_warning("Database", "No migrations found")
         else:
             self.log_issue("Database", "Alembic directory missing")
         
         # Check models
-        models_file = self.root / "data" / "models.py"
-        if models_file.exists():
-            content = models_file.read_text()
+        content = self._models_src
+        if content:
             if "Base" in content and "SQLAlchemy" in content or "sqlalchemy" in content:
                 self.log_pass("Database", "SQLAlchemy models configured")
             else:
                 self.log_warning("Database", "SQLAlchemy setup unclear")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Database' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Database' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Database' in i])}")
+        self.print_summary("Database")
     
     def audit_testing(self):
         """Audit testing setup."""
         print("\n🧪 [8/8] TESTING AUDIT")
         print("=" * 70)
         
-        test_files = list(self.root.glob("test*.py"))
+        test_files = [
+            name for name in self._root_names
+            if name.startswith("test") and name.endswith(".py")
+        ]
         
         if test_files:
             self.log_pass("Testing", f"Test file(s) exist ({len(test_files)} file(s))")
@@ -319,22 +454,18 @@ class BotAuditor:
             self.log_warning("Testing", "No test files found")
         
         # Check for test scenarios
-        test_scenarios = self.root / "TEST_SCENARIOS.md"
-        if test_scenarios.exists():
+        if "TEST_SCENARIOS.md" in self._root_names:
             self.log_pass("Testing", "Test scenarios documented")
         else:
             self.log_warning("Testing", "Test scenarios not documented")
         
         # Check for test report
-        test_report = self.root / "TEST_REPORT.md"
-        if test_report.exists():
+        if "TEST_REPORT.md" in self._root_names:
             self.log_pass("Testing", "Test report exists")
         else:
             self.log_warning("Testing", "Test report not found")
         
-        print(f"  ✅ Passed: {len([p for p in self.passed if 'Testing' in p])}")
-        print(f"  ⚠️  Warnings: {len([w for w in self.warnings if 'Testing' in w])}")
-        print(f"  ❌ Issues: {len([i for i in self.issues if 'Testing' in i])}")
+        self.print_summary("Testing")
     
     def generate_report(self):
         """Generate final audit report."""
@@ -359,13 +490,13 @@ class BotAuditor:
         
         if total_issues > 0:
             print("\n❌ CRITICAL ISSUES:")
-            for issue in self.issues:
-                print(f"  • {issue}")
+            for category, message in self.issues:
+                print(f"  • [{category}] {message}")
         
         if total_warnings > 0:
             print("\n⚠️  WARNINGS:")
-            for warning in self.warnings[:10]:  # Show first 10
-                print(f"  • {warning}")
+            for category, message in self.warnings[:10]:  # Show first 10
+                print(f"  • [{category}] {message}")
             if len(self.warnings) > 10:
                 print(f"  ... and {len(self.warnings) - 10} more")
         
@@ -389,6 +520,7 @@ class BotAuditor:
         print(f"\n🔍 Starting comprehensive audit at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 70)
         
+        self._prepare()
         self.audit_security()
         self.audit_code_quality()
         self.audit_functionality()
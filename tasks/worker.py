@@ -1,28 +1,137 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import multiprocessing
+import os
+import signal
+from typing import Optional
 
-from redis import Redis
-from rq import Queue, Worker
+from arq.connections import ArqRedis, RedisSettings
+from arq.worker import Worker, func
+from redis.asyncio import ConnectionPool
 
 from bot.config import get_bot_config
+from tasks.tasks import process_event, send_message
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+QUEUE_NAMES = ("watcher", "bot")
+# Connections beyond one per running job: each worker's poll loop, health checks
+# and job bookkeeping also check connections out
+REDIS_POOL_HEADROOM = 10
+
+
+class WorkerSettings:
+    """arq worker settings; jobs are coroutines running on the worker's event loop."""
+
+    # Notifications are fire-and-forget: don't write a result key back to Redis
+    functions = [
+        func(send_message, keep_result=0, timeout=15),
+        process_event,
+    ]
+    redis_settings = RedisSettings.from_dsn(get_bot_config().redis_url)
+    # Jobs run concurrently per worker; arq reads max(max_jobs * 5, 100) ids per poll
+    max_jobs = int(os.getenv("WORKER_MAX_JOBS", "50"))
+
+
+class SharedPoolRedis(ArqRedis):
+    """ArqRedis whose close() leaves the connection pool open for other workers."""
+
+    async def close(self, close_connection_pool: Optional[bool] = None) -> None:
+        # Worker.close() always asks to close the pool; run_workers owns it instead
+        await self.aclose(close_connection_pool=False)
+
+
+def build_redis_pool(redis_url: str, max_connections: int) -> ArqRedis:
+    """
+    One keep-alive connection pool shared by all workers in the process.
+
+    redis-py picks the hiredis RESP parser automatically when ``hiredis`` is
+    installed (``redis[hiredis]`` in the project dependencies).
+    """
+    pool = ConnectionPool.from_url(
+        redis_url,
+        max_connections=max_connections,
+        socket_keepalive=True,
+        socket_timeout=30,
+        health_check_interval=30,
+    )
+    return SharedPoolRedis(connection_pool=pool)
+
+
+def build_worker(queue_name: str, redis_pool: ArqRedis) -> Worker:
+    return Worker(
+        functions=WorkerSettings.functions,
+        redis_pool=redis_pool,
+        queue_name=queue_name,
+        max_jobs=WorkerSettings.max_jobs,
+        # Several workers share the loop; run_workers installs one handler for all
+        handle_signals=False,
+    )
+
+
+def get_queue_names() -> tuple[str, ...]:
+    """Queues served by this worker; WORKER_QUEUES binds a deployment to a subset."""
+    configured = os.getenv("WORKER_QUEUES")
+    if not configured:
+        return QUEUE_NAMES
+    return tuple(name.strip() for name in configured.split(",") if name.strip())
+
+
+async def run_workers(queue_names: tuple[str, ...]) -> None:
+    # Jobs run in-process on the event loop (no fork per job); arq workers consume
+    # a single queue each, so run one per queue on the same loop
+    # Every running job may enqueue or store a result, so size the pool for all of
+    # them across the workers sharing it; WORKER_REDIS_CONNECTIONS overrides
+    configured = os.getenv("WORKER_REDIS_CONNECTIONS")
+    max_connections = (
+        int(configured) if configured
+        else WorkerSettings.max_jobs * len(queue_names) + REDIS_POOL_HEADROOM
+    )
+    redis_pool = build_redis_pool(get_bot_config().redis_url, max_connections)
+    workers = [build_worker(name, redis_pool) for name in queue_names]
+    logger.info("Starting arq workers for queues: %s", list(queue_names))
+
+    # Stop every worker on SIGINT/SIGTERM; close() then cancels their jobs
+    main_task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, main_task.cancel)
+
+    try:
+        await asyncio.gather(*(worker.async_run() for worker in workers))
+    except asyncio.CancelledError:
+        logger.info("Shutting down arq workers")
+    finally:
+        await asyncio.gather(*(worker.close() for worker in workers))
+        await redis_pool.connection_pool.disconnect()
+
+
+def _run_process(queue_names: tuple[str, ...]) -> None:
+    asyncio.run(run_workers(queue_names))
+
 
 def main() -> None:
-    config = get_bot_config()
-    redis = Redis.from_url(config.redis_url)
-    
-    # Create queues
-    queues = [Queue(name, connection=redis) for name in ["watcher", "bot"]]
-    
-    # Create worker with queues
-    worker = Worker(queues, connection=redis)
-    logger.info("Starting RQ worker for queues: %s", [q.name for q in worker.queues])
-    worker.work()
+    queue_names = get_queue_names()
+    num_processes = int(os.getenv("WORKER_PROCESSES", str(os.cpu_count() or 1)))
+    if num_processes <= 1:
+        _run_process(queue_names)
+        return
+
+    logger.info("Starting %d worker processes", num_processes)
+    processes = [
+        multiprocessing.Process(
+            target=_run_process, args=(queue_names,), name=f"arq-worker-{i}"
+        )
+        for i in range(num_processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Test script for new UX features: /faq, /stats, improved /help and error messages
 """
 import asyncio
 import os
+import re
 import sys
 from datetime import datetime
 
@@ -15,6 +16,18 @@ BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "8352448142:AAFtzNHlVARgBUyL1_Mt4_Ij
 TEST_USER_ID = 577784602  # Your user ID
 BASE_URL = f"https://api.telegram.org/bot{BOT_TOKEN}"
 
+# Feature label -> byte strings that must all appear in bot/handlers.py
+CODE_CHECKS = [
+    ("/faq command", (b'Command("faq")', b"Frequently Asked Questions")),
+    ("/stats command", (b'Command("stats")', "статистика".encode())),
+    ("Improved /help", (b"Example TX Hashes", b"Block Explorers")),
+    ("Improved error messages", ("💡 Что делать?".encode(),)),
+]
+# Every needle in one alternation, so the file is scanned in a single pass
+_NEEDLE_RE = re.compile(
+    b"|".join(re.escape(needle) for _, needles in CODE_CHECKS for needle in needles)
+)
+
 
 async def send_message_to_bot(command: str, user_id: int = TEST_USER_ID) -> dict:
     """Simulate sending a message to the bot."""
@@ -108,53 +121,42 @@ async def test_improved_error_technical():
     return True
 
 
-async def verify_code_implementation():
+def _read_file_bytes(path: str):
+    """Read a file as bytes, or return None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+async def read_handlers_source():
+    """Read bot/handlers.py off the event loop so it overlaps other awaits."""
+    return await asyncio.to_thread(_read_file_bytes, "bot/handlers.py")
+
+
+async def verify_code_implementation(content=None):
     """Verify the code changes are actually in place."""
     print("\n🔍 Verifying code implementation...")
     
     checks = []
     
-    # Check handlers.py for new commands
-    try:
-        with open("bot/handlers.py", "r") as f:
-            content = f.read()
-            
-            # Check for /faq
-            if 'Command("faq")' in content and "Frequently Asked Questions" in content:
-                print("  ✅ /faq command found in code")
-                checks.append(True)
-            else:
-                print("  ❌ /faq command NOT found in code")
-                checks.append(False)
-            
-            # Check for /stats
-            if 'Command("stats")' in content and "статистика" in content:
-                print("  ✅ /stats command found in code")
-                checks.append(True)
-            else:
-                print("  ❌ /stats command NOT found in code")
-                checks.append(False)
-            
-            # Check for improved help
-            if "Example TX Hashes" in content and "Block Explorers" in content:
-                print("  ✅ Improved /help found in code")
-                checks.append(True)
-            else:
-                print("  ❌ Improved /help NOT found in code")
-                checks.append(False)
-            
-            # Check for improved error messages
-            if "💡 Что делать?" in content:
-                print("  ✅ Improved error messages found in code")
-                checks.append(True)
-            else:
-                print("  ❌ Improved error messages NOT found in code")
-                checks.append(False)
-    
-    except FileNotFoundError:
+    # Check handlers.py for new commands; read once as bytes, no decode needed
+    if content is None:
+        content = await read_handlers_source()
+    if content is None:
         print("  ❌ bot/handlers.py not found!")
         return False
     
+    seen = set(_NEEDLE_RE.findall(content))
+    for label, needles in CODE_CHECKS:
+        if seen.issuperset(needles):
+            print(f"  ✅ {label} found in code")
+            checks.append(True)
+        else:
+            print(f"  ❌ {label} NOT found in code")
+            checks.append(False)
+    
     return all(checks)
 
 
@@ -192,15 +194,17 @@ async def main():
     print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
-    # Check bot is running
-    bot_ok = await check_bot_status()
+    # Check bot is running while handlers.py is read in the background
+    bot_ok, handlers_src = await asyncio.gather(
+        check_bot_status(), read_handlers_source()
+    )
     
     if not bot_ok:
         print("\n⚠️  Warning: Bot may not be running or accessible")
         print("   Tests will verify code structure only\n")
     
     # Verify code implementation
-    code_ok = await verify_code_implementation()
+    code_ok = await verify_code_implementation(handlers_src)
     
     if not code_ok:
         print("\n❌ FAIL: Code verification failed!")
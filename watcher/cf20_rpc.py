@@ -4,14 +4,66 @@ Implements methods: TX_HISTORY, MEMPOOL, TOKEN_INFO
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import importlib.util
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+try:
+    import ijson
+except ImportError:  # optional: streams large tx_all_history results, falls back to one parse
+    ijson = None
 
 
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {"content-type": "application/json"}
+# Cap on concurrent RPCs per client, well under the connection pool size
+MAX_IN_FLIGHT = 16
+
+
+@functools.lru_cache(maxsize=None)
+def _request_prefix(method: str) -> bytes:
+    """Constant JSON-RPC envelope up to the params value, built once per method."""
+    return b'{"jsonrpc":"2.0","id":1,"method":' + orjson.dumps(method) + b',"params":'
+
+
+class _AsyncByteReader:
+    """Async file-like view over an httpx byte stream, the shape ijson reads from."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str; don't consume a chunk
+        if size == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
+
+def _history_list(result: Any) -> List[Dict[str, Any]]:
+    """Normalize a tx_history result: dict (single tx) or list (multiple txs)."""
+    if isinstance(result, dict):
+        return [result] if result else []
+    return result or []
+
+
+def _mempool_list(result: Any) -> List[Dict[str, Any]]:
+    """Normalize a mempool result, which may wrap the list in a dict."""
+    if isinstance(result, dict):
+        return result.get("list", [])
+    return result or []
+
 
 class CF20RPCClient:
     """Client for interacting with Cellframe node JSON-RPC API."""
@@ -28,6 +80,39 @@ class CF20RPCClient:
         self.rpc_url = rpc_url.rstrip("/")
         self.network = network
         self.timeout = timeout
+        # Persistent client so consecutive RPCs reuse keep-alive connections;
+        # HTTP/2 multiplexes them over one connection when h2 is installed
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            # Pool settings live on the transport when one is passed explicitly
+            transport=httpx.AsyncHTTPTransport(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=120,
+                ),
+            ),
+        )
+        self._sem = asyncio.Semaphore(MAX_IN_FLIGHT)
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        # One pre-bound coroutine per RPC method used by this client
+        self._rpc_tx_history = functools.partial(self._call, "tx_history")
+        self._rpc_tx_all_history = functools.partial(self._call, "tx_all_history")
+        self._rpc_mempool = functools.partial(self._call, "mempool")
+        self._rpc_mempool_check = functools.partial(self._call, "mempool_check")
+        self._rpc_token_info = functools.partial(self._call, "token_info")
+        self._rpc_token_list = functools.partial(self._call, "token_list")
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "CF20RPCClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
 
     async def _call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -44,29 +129,57 @@ class CF20RPCClient:
             httpx.HTTPError: On network/HTTP errors
             ValueError: On RPC error response
         """
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": params or {},
-        }
-
+        body = _request_prefix(method) + orjson.dumps(params or {}) + b"}"
+
+        # Identical concurrent requests (e.g. many users tracking one tx) share
+        # a single RPC; the serialized body is the key
+        task = self._inflight.get(body)
+        if task is None:
+            task = asyncio.ensure_future(self._post(body))
+            self._inflight[body] = task
+            task.add_done_callback(functools.partial(self._forget, body))
+        return await asyncio.shield(task)
+
+    def _forget(self, body: bytes, task: asyncio.Future) -> None:
+        """Drop a finished request from the in-flight map."""
+        self._inflight.pop(body, None)
+        # Every caller may have been cancelled (e.g. by a poll timeout); retrieve
+        # the error so asyncio doesn't log it a second time after _post did
+        if not task.cancelled():
+            task.exception()
+
+    async def _send(self, body: bytes) -> httpx.Response:
+        """POST an encoded JSON-RPC payload, retrying transport failures."""
+        async with self._sem:
+            # Back off with jitter on connection-level failures instead of
+            # hammering a struggling node; HTTP/RPC errors are not retried
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception_type(httpx.TransportError),
+                wait=wait_random_exponential(multiplier=0.2, max=5),
+                stop=stop_after_attempt(3),
+                reraise=True,
+            ):
+                with attempt:
+                    response = await self._client.post(
+                        self.rpc_url,
+                        content=body,
+                        headers=JSON_HEADERS,
+                    )
+        response.raise_for_status()
+        return response
+
+    async def _post(self, body: bytes) -> Dict[str, Any]:
+        """Send an encoded JSON-RPC request and return its result."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.rpc_url,
-                    json=payload,
-                    timeout=self.timeout,
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._send(body)
+            data = orjson.loads(response.content)
 
-                if "error" in data:
-                    error_msg = data["error"].get("message", "Unknown RPC error")
-                    logger.error("CF-20 RPC error: %s", error_msg)
-                    raise ValueError(f"RPC error: {error_msg}")
+            if "error" in data:
+                error_msg = data["error"].get("message", "Unknown RPC error")
+                logger.error("CF-20 RPC error: %s", error_msg)
+                raise ValueError(f"RPC error: {error_msg}")
 
-                return data.get("result", {})
+            return data.get("result", {})
 
         except httpx.HTTPError as e:
             logger.error("CF-20 RPC HTTP error: %s", e)
@@ -101,11 +214,8 @@ class CF20RPCClient:
             params["limit"] = limit
 
         try:
-            result = await self._call("tx_history", params)
-            # Result can be dict (single tx) or list (multiple txs)
-            if isinstance(result, dict):
-                return [result] if result else []
-            return result or []
+            result = await self._rpc_tx_history(params)
+            return _history_list(result)
         except Exception as e:
             logger.warning("Failed to get tx_history: %s", e)
             return []
@@ -134,12 +244,61 @@ class CF20RPCClient:
             params["chain"] = chain
 
         try:
-            result = await self._call("tx_all_history", params)
+            result = await self._rpc_tx_all_history(params)
             return result or []
         except Exception as e:
             logger.warning("Failed to get tx_all_history: %s", e)
             return []
 
+    async def iter_tx_all_history(
+        self,
+        address: str,
+        chain: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream complete transaction history for address, one transaction at a time.
+
+        Decodes the response incrementally with ijson when it is installed, so
+        long histories are never materialized as a whole; otherwise falls back
+        to tx_all_history.
+
+        Args:
+            address: CF-20 address to query
+            chain: Optional specific chain name
+
+        Yields:
+            Transaction dictionaries
+        """
+        if ijson is None:
+            for tx in await self.tx_all_history(address, chain):
+                yield tx
+            return
+
+        params = {
+            "net": self.network,
+            "addr": address,
+        }
+
+        if chain:
+            params["chain"] = chain
+
+        body = _request_prefix("tx_all_history") + orjson.dumps(params) + b"}"
+
+        try:
+            async with self._sem:
+                async with self._client.stream(
+                    "POST",
+                    self.rpc_url,
+                    content=body,
+                    headers=JSON_HEADERS,
+                ) as response:
+                    response.raise_for_status()
+                    reader = _AsyncByteReader(response.aiter_bytes())
+                    async for tx in ijson.items_async(reader, "result.item", use_float=True):
+                        yield tx
+        except Exception as e:
+            logger.warning("Failed to stream tx_all_history: %s", e)
+
     async def mempool_list(self) -> List[Dict[str, Any]]:
         """
         Get list of transactions in mempool.
@@ -152,15 +311,70 @@ class CF20RPCClient:
         }
 
         try:
-            result = await self._call("mempool", params)
-            # Handle different response formats
-            if isinstance(result, dict):
-                return result.get("list", [])
-            return result or []
+            result = await self._rpc_mempool(params)
+            return _mempool_list(result)
         except Exception as e:
             logger.warning("Failed to get mempool list: %s", e)
             return []
 
+    async def poll_batched(
+        self,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get recent transaction history and the mempool in one JSON-RPC batch.
+
+        Falls back to two separate calls if the node rejects the batch.
+
+        Args:
+            limit: Maximum number of history transactions to return
+
+        Returns:
+            Tuple of (history transactions, mempool transactions)
+        """
+        body = orjson.dumps([
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tx_history",
+                "params": {"net": self.network, "limit": limit},
+            },
+            {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "mempool",
+                "params": {"net": self.network},
+            },
+        ])
+
+        try:
+            response = await self._send(body)
+            data = orjson.loads(response.content)
+            if not isinstance(data, list):
+                raise ValueError("node did not answer with a batch reply")
+            replies = {reply.get("id"): reply for reply in data}
+        except Exception as e:
+            logger.warning("Batch poll failed, falling back to single calls: %s", e)
+            history, mempool = await asyncio.gather(
+                self.tx_history(limit=limit), self.mempool_list()
+            )
+            return history, mempool
+
+        results = []
+        for reply_id, normalize in ((1, _history_list), (2, _mempool_list)):
+            reply = replies.get(reply_id) or {"error": {"message": "missing reply"}}
+            if "error" in reply:
+                # JSON-RPC reports errors per batch element; the other one still counts
+                logger.warning(
+                    "CF-20 batch element %d failed: %s",
+                    reply_id,
+                    reply["error"].get("message", "Unknown RPC error"),
+                )
+                results.append([])
+            else:
+                results.append(normalize(reply.get("result", {})))
+        return results[0], results[1]
+
     async def mempool_check(self, tx_hash: str) -> bool:
         """
         Check if transaction is in mempool.
@@ -177,7 +391,7 @@ class CF20RPCClient:
         }
 
         try:
-            result = await self._call("mempool_check", params)
+            result = await self._rpc_mempool_check(params)
             # Result format may vary
             if isinstance(result, dict):
                 return result.get("in_mempool", False)
@@ -202,7 +416,7 @@ class CF20RPCClient:
         }
 
         try:
-            result = await self._call("token_info", params)
+            result = await self._rpc_token_info(params)
             return result
         except Exception as e:
             logger.warning("Failed to get token info: %s", e)
@@ -220,7 +434,7 @@ class CF20RPCClient:
         }
 
         try:
-            result = await self._call("token_list", params)
+            result = await self._rpc_token_list(params)
             if isinstance(result, list):
                 return result
             # Handle dict response with tokens key
@@ -241,13 +455,15 @@ class CF20RPCClient:
         Returns:
             Status string or None
         """
-        # First check mempool
-        in_mempool = await self.mempool_check(tx_hash)
+        # Mempool and history lookups are independent, so issue both at once
+        in_mempool, txs = await asyncio.gather(
+            self.mempool_check(tx_hash),
+            self.tx_history(tx_hash=tx_hash),
+        )
+        # Both helpers log and swallow their own RPC errors
         if in_mempool:
             return "pending"
 
-        # Check transaction history
-        txs = await self.tx_history(tx_hash=tx_hash)
         if txs:
             tx = txs[0]
             # Parse status from transaction data
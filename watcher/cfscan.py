@@ -3,10 +3,15 @@ CFSCAN integration for public transaction verification.
 """
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +24,7 @@ class CFSCANClient:
         self,
         api_url: str = "https://scan.cellframe.net/api",
         timeout: int = 30,
+        client: Optional[httpx.AsyncClient] = None,
     ):
         """
         Initialize CFSCAN client.
@@ -26,9 +32,27 @@ class CFSCANClient:
         Args:
             api_url: CFSCAN API base URL
             timeout: Request timeout in seconds
+            client: Optional shared HTTP client; one is created if omitted
         """
         self.api_url = api_url.rstrip("/")
         self.timeout = timeout
+        self._owns_client = client is None
+        # Persistent client so consecutive lookups reuse keep-alive connections;
+        # HTTP/2 multiplexes them over one connection when h2 is installed
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout,
+            # Pool settings live on the transport when one is passed explicitly
+            transport=httpx.AsyncHTTPTransport(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                retries=1,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool if this client created it."""
+        if self._owns_client:
+            await self._client.aclose()
 
     async def get_transaction(self, tx_hash: str) -> Optional[Dict]:
         """
@@ -41,17 +65,15 @@ class CFSCANClient:
             Transaction data or None if not found
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/transaction/{tx_hash}",
-                    timeout=self.timeout,
-                )
+            response = await self._client.get(
+                f"{self.api_url}/transaction/{tx_hash}",
+            )
                 
-                if response.status_code == 404:
-                    return None
+            if response.status_code == 404:
+                return None
                 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return orjson.loads(response.content)
 
         except httpx.HTTPError as e:
             logger.error("CFSCAN API error for tx %s: %s", tx_hash, e)
@@ -78,16 +100,14 @@ class CFSCANClient:
             List of transactions
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/address/{address}/transactions",
-                    params={"limit": limit, "offset": offset},
-                    timeout=self.timeout,
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._client.get(
+                f"{self.api_url}/address/{address}/transactions",
+                params={"limit": limit, "offset": offset},
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
                 
-                return data.get("transactions", [])
+            return data.get("transactions", [])
 
         except Exception as e:
             logger.error("Error getting address txs from CFSCAN: %s", e)
@@ -104,17 +124,15 @@ class CFSCANClient:
             Block data or None if not found
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/block/{block_number}",
-                    timeout=self.timeout,
-                )
+            response = await self._client.get(
+                f"{self.api_url}/block/{block_number}",
+            )
                 
-                if response.status_code == 404:
-                    return None
+            if response.status_code == 404:
+                return None
                 
-                response.raise_for_status()
-                return response.json()
+            response.raise_for_status()
+            return orjson.loads(response.content)
 
         except Exception as e:
             logger.error("Error getting block from CFSCAN: %s", e)
@@ -128,15 +146,13 @@ class CFSCANClient:
             Latest block number or None
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/blocks/latest",
-                    timeout=self.timeout,
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._client.get(
+                f"{self.api_url}/blocks/latest",
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
                 
-                return data.get("block_number")
+            return data.get("block_number")
 
         except Exception as e:
             logger.error("Error getting latest block from CFSCAN: %s", e)
@@ -162,16 +178,14 @@ class CFSCANClient:
             if chain:
                 params["chain"] = chain
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/search",
-                    params=params,
-                    timeout=self.timeout,
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._client.get(
+                f"{self.api_url}/search",
+                params=params,
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
                 
-                return data.get("results", [])
+            return data.get("results", [])
 
         except Exception as e:
             logger.error("Error searching CFSCAN: %s", e)
@@ -246,15 +260,38 @@ class CFSCANClient:
 class CFSCANIntegration:
     """Integration service for CFSCAN with caching and fallback."""
 
-    def __init__(self, api_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        cache_ttl: int = 60,
+        cache_size: int = 4096,
+    ):
         """
         Initialize CFSCAN integration.
 
         Args:
             api_url: Optional custom CFSCAN API URL
+            cache_ttl: Maximum lifetime of cached transactions in seconds
+            cache_size: Maximum number of cached transactions
         """
         self.client = CFSCANClient(api_url) if api_url else CFSCANClient()
-        self._cache: Dict[str, any] = {}
+        # Values are (fetched_at, tx) so callers can ask for a shorter TTL
+        self._cache: TTLCache[str, tuple[float, dict]] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._latest_block: TTLCache[str, int] = TTLCache(maxsize=1, ttl=2)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fetch once per key; concurrent callers await the same in-flight request."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def aclose(self) -> None:
+        """Close the underlying CFSCAN client."""
+        await self.client.aclose()
 
     async def get_transaction_with_cache(
         self,
@@ -273,18 +310,36 @@ class CFSCANIntegration:
         """
         # Check cache
         cache_key = f"tx:{tx_hash}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cached = self._cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < cache_ttl:
+            return cached[1]
 
         # Fetch from CFSCAN
-        tx = await self.client.get_transaction(tx_hash)
+        tx = await self._single_flight(
+            cache_key, lambda: self.client.get_transaction(tx_hash)
+        )
         
         if tx:
-            self._cache[cache_key] = tx
-            # Note: In production, implement proper cache expiry
+            self._cache[cache_key] = (time.monotonic(), tx)
         
         return tx
 
+    async def get_latest_block(self) -> Optional[int]:
+        """
+        Get latest block number, cached for 2 seconds.
+
+        Returns:
+            Latest block number or None
+        """
+        block = self._latest_block.get("latest")
+        if block is not None:
+            return block
+
+        block = await self._single_flight("latest_block", self.client.get_latest_block)
+        if block is not None:
+            self._latest_block["latest"] = block
+        return block
+
     def format_transaction_link(
         self,
         tx_hash: str,
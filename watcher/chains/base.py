@@ -1,7 +1,106 @@
 from __future__ import annotations
 
 import abc
-from typing import Iterable, List
+import asyncio
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Hashable, Iterable, List, Optional, Set
+
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Write beside the target, then swap, so a crash never leaves half a file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class SeenHashes:
+    """Bounded set of recently seen tx hashes; the oldest is evicted first."""
+
+    def __init__(self, maxlen: int = 10000) -> None:
+        self._order: Deque[Hashable] = deque(maxlen=maxlen)
+        self._members: Set[Hashable] = set()
+
+    def __contains__(self, tx_hash: Hashable) -> bool:
+        return tx_hash in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @classmethod
+    def load(cls, path: str, maxlen: int = 10000) -> "SeenHashes":
+        """Restore hashes written by save(); starts empty if the file is missing or corrupt."""
+        seen = cls(maxlen=maxlen)
+        try:
+            with open(path, "rb") as f:
+                hashes = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return seen
+        for tx_hash in hashes:
+            seen.add(tx_hash)
+        return seen
+
+    async def save(self, path: str) -> None:
+        """Persist the hashes, oldest first, so a restarted watcher skips them."""
+        # Serialize on the loop, where the deque cannot change mid-iteration;
+        # only str hashes are JSON-serializable
+        data = orjson.dumps(list(self._order))
+        await asyncio.to_thread(_write_atomic, path, data)
+
+    def add(self, tx_hash: Hashable) -> None:
+        if tx_hash in self._members:
+            return
+        if len(self._order) == self._order.maxlen:
+            # deque.append below drops the oldest entry; forget it here too
+            self._members.discard(self._order[0])
+        self._order.append(tx_hash)
+        self._members.add(tx_hash)
+
+
+@dataclass(slots=True)
+class TxEvent:
+    """EVM transaction event with a fixed slot layout instead of a per-event dict."""
+
+    chain: str
+    type: str
+    hash: str
+    from_: Optional[str]
+    to: Optional[str]
+    value: str
+    gas_price: str
+    contract: str
+    block_number: Optional[int] = None
+    # Filled in from the receipt once the transaction is mined
+    status: Optional[int] = None
+    gas_used: Optional[str] = None
+    transfers: Optional[List[dict]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the event in the dict shape consumed by the task queue."""
+        event = {
+            "chain": self.chain,
+            "type": self.type,
+            "hash": self.hash,
+            "from": self.from_,
+            "to": self.to,
+            "value": self.value,
+            "gas_price": self.gas_price,
+            "contract": self.contract,
+        }
+        # Pending txs have no block and unmined ones no receipt; omit those keys
+        for key in ("block_number", "status", "gas_used", "transfers"):
+            value = getattr(self, key)
+            if value is not None:
+                event[key] = value
+        return event
 
 
 class BaseChainWatcher(abc.ABC):
@@ -13,24 +112,47 @@ class BaseChainWatcher(abc.ABC):
         self.poll_interval = poll_interval
 
     @abc.abstractmethod
-    async def poll_new_transactions(self) -> Iterable[dict]:
+    async def poll_new_transactions(self) -> Iterable[dict | TxEvent]:
         """Return an iterable with new bridge-related transactions."""
 
     @abc.abstractmethod
-    async def poll_mempool(self) -> Iterable[dict]:
+    async def poll_mempool(self) -> Iterable[dict | TxEvent]:
         """Return an iterable with in-flight transactions from the mempool."""
 
-    async def collect(self) -> List[dict]:
-        events: List[dict] = []
-        events.extend(await self._collect_safe(self.poll_new_transactions))
-        events.extend(await self._collect_safe(self.poll_mempool))
-        return events
+    async def aclose(self) -> None:
+        """Release network resources held by the watcher."""
 
-    async def _collect_safe(self, func) -> List[dict]:
+    async def prepare(self) -> None:
+        """Hook run before each poll cycle, e.g. for lazy async setup."""
+
+    def _polls(self) -> tuple:
+        """Polls run each cycle; each gets its own timeout and error isolation."""
+        return (self.poll_new_transactions, self.poll_mempool)
+
+    async def stream(self) -> AsyncIterator[dict | TxEvent]:
+        """Yield events as soon as each poll finishes rather than after all of them."""
+        await self.prepare()
+        # The polls hit independent RPCs, so run them concurrently
+        for done in asyncio.as_completed(
+            [self._collect_safe(poll) for poll in self._polls()]
+        ):
+            for event in await done:
+                yield event
+
+    async def collect(self) -> List[dict | TxEvent]:
+        return [event async for event in self.stream()]
+
+    async def _collect_safe(self, func) -> List[dict | TxEvent]:
+        # A stuck RPC must not hold up the other poll or the next cycle
+        timeout = self.poll_interval * 0.8
         try:
-            data = await func()
-            return list(data)
+            data = await asyncio.wait_for(func(), timeout=timeout)
+            # Watchers already return lists; only copy other iterables
+            return data if isinstance(data, list) else list(data)
+        except asyncio.TimeoutError:
+            logger.warning("[%s] %s timed out after %.0fs", self.name, func.__name__, timeout)
+            return []
         except Exception as exc:  # pragma: no cover - defensive logging
             # In production you would send this to Sentry/Prometheus etc.
-            print(f"[{self.name}] error while polling: {exc}")
+            logger.error("[%s] error while polling: %s", self.name, exc)
             return []
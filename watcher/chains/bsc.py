@@ -1,21 +1,50 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from typing import Iterable, List, Set
+from typing import Iterable, List, Optional
 
-from web3 import Web3
+import aiohttp
+import orjson
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
 try:
     from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware
+    async_geth_poa_middleware = geth_poa_middleware
 except ImportError:
-    from web3.middleware import geth_poa_middleware
+    from web3.middleware import async_geth_poa_middleware, geth_poa_middleware
 
-from watcher.chains.base import BaseChainWatcher
+from watcher.chains.base import BaseChainWatcher, SeenHashes, TxEvent
 from watcher.evm_tracker import EVMTransactionTracker
 
 
 logger = logging.getLogger(__name__)
 
+# Public BSC endpoints throttle large batches; keep each one small
+BLOCK_BATCH_SIZE = 25
+# Max receipt lookups in flight at once
+RECEIPT_CONCURRENCY = 64
+# Keep-alive connections to the node shared by concurrent block/receipt fetches
+NODE_CONNECTIONS = 32
+# Max CELL transactions reported per mempool poll
+MEMPOOL_MATCH_LIMIT = 20
+JSON_HEADERS = {"content-type": "application/json"}
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = bytes.fromhex(
+    "ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+)
+
+
+@functools.lru_cache(maxsize=8192)
+def _checksum(address: str) -> str:
+    """Checksum a raw lowercase address; bots and hot wallets recur, so skip the keccak."""
+    return Web3.to_checksum_address(address)
+
+
+def _cell_txs(txs: Iterable[dict], contract: str) -> List[dict]:
+    """Keep raw txs sent to contract (lowercase); contract creations have no 'to'."""
+    return [tx for tx in txs if (tx["to"] or "").lower() == contract]
+
 
 class BSCWatcher(BaseChainWatcher):
     """Watcher for Binance Smart Chain."""
@@ -41,25 +70,196 @@ class BSCWatcher(BaseChainWatcher):
             cell_contract_address: CELL BEP-20 token contract address
         """
         super().__init__(poll_interval=poll_interval)
-        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
-        self.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        # Polling awaits the node directly on the event loop instead of via to_thread
+        self.web3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
+        self.web3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+        self.rpc_url = rpc_url
         self.api_key = bscscan_api_key
         self.cell_contract = cell_contract_address.lower()
-        self.tracker = EVMTransactionTracker(self.web3, confirmations_required)
-        self._seen_tx_hashes: Set[str] = set()
+        self._cell_checksum = Web3.to_checksum_address(self.cell_contract)
+        # EVMTransactionTracker works with a sync Web3 instance
+        tracker_web3 = Web3(Web3.HTTPProvider(rpc_url))
+        tracker_web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        self.tracker = EVMTransactionTracker(tracker_web3, confirmations_required)
+        self._seen_tx_hashes = SeenHashes(maxlen=10000)
         self._last_block: int = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def aclose(self) -> None:
+        """Close the async provider's HTTP session."""
+        await self.web3.provider.disconnect()
+
+    async def _ensure_session(self) -> None:
+        """
+        Give the provider a pooled keep-alive session.
+
+        web3's default async session force-closes every connection, so
+        concurrent batches and receipt lookups would each pay a new handshake.
+        Created lazily because aiohttp sessions must be made inside the loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                raise_for_status=True,
+                connector=aiohttp.TCPConnector(limit=NODE_CONNECTIONS, keepalive_timeout=60),
+            )
+            await self.web3.provider.cache_async_session(self._session)
+
+    async def prepare(self) -> None:
+        await self._ensure_session()
+
+    async def _fetch_blocks(self, block_nums: range) -> List[Optional[dict]]:
+        """
+        Fetch full blocks for block_nums in a single raw JSON-RPC batch request.
+
+        Bypasses web3's formatters: only a few tx fields are read, so the raw
+        hex strings are used as-is instead of converting every field of every tx.
+
+        Returns:
+            Raw block dicts in block_nums order, None where the node returned none
+        """
+        payload = orjson.dumps([
+            {
+                "jsonrpc": "2.0",
+                "id": block_num,
+                "method": "eth_getBlockByNumber",
+                "params": [hex(block_num), True],
+            }
+            for block_num in block_nums
+        ])
+        async with self._session.post(
+            self.rpc_url, data=payload, headers=JSON_HEADERS
+        ) as response:
+            replies = orjson.loads(await response.read())
+        results = {reply.get("id"): reply.get("result") for reply in replies}
+        return [results.get(block_num) for block_num in block_nums]
+
+    async def _fetch_pending_block(self) -> dict:
+        """
+        Fetch the pending block with full raw transactions.
+
+        Like _fetch_blocks, skips web3's formatters: a busy pending pool holds
+        thousands of txs and only the few CELL matches are converted.
 
-    async def poll_new_transactions(self) -> Iterable[dict]:
+        Returns:
+            Raw block dict, empty if the node has no pending block
+        """
+        payload = orjson.dumps({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "eth_getBlockByNumber",
+            "params": ["pending", True],
+        })
+        async with self._session.post(
+            self.rpc_url, data=payload, headers=JSON_HEADERS
+        ) as response:
+            reply = orjson.loads(await response.read())
+        return reply.get("result") or {}
+
+    async def _attach_receipts(self, matches: List[tuple]) -> None:
+        """
+        Fetch receipts for matched transactions concurrently and merge them in.
+
+        Args:
+            matches: (event, raw tx hash) pairs; events are updated in place
+        """
+        sem = asyncio.Semaphore(RECEIPT_CONCURRENCY)
+
+        async def fetch(tx_hash):
+            async with sem:
+                return await self.web3.eth.get_transaction_receipt(tx_hash)
+
+        receipts = await asyncio.gather(
+            *(fetch(tx_hash) for _, tx_hash in matches),
+            return_exceptions=True,
+        )
+
+        for (event, _), receipt in zip(matches, receipts):
+            if isinstance(receipt, BaseException):
+                logger.warning("Failed to get receipt for %s: %s", event.hash, receipt)
+                continue
+            event.status = receipt.get("status")
+            event.gas_used = str(receipt.get("gasUsed", 0))
+            event.transfers = [
+                {
+                    "from": "0x" + bytes(log["topics"][1][-20:]).hex(),
+                    "to": "0x" + bytes(log["topics"][2][-20:]).hex(),
+                    "value": str(int.from_bytes(log["data"], "big")),
+                }
+                for log in receipt.get("logs", [])
+                if len(log["topics"]) == 3 and log["topics"][0] == TRANSFER_TOPIC
+            ]
+
+    async def _scan_blocks(self, start_block: int, end_block: int) -> List[tuple]:
+        """
+        Find new transactions sent to the CELL contract by downloading blocks.
+
+        Returns:
+            (event, tx hash) pairs for transactions not seen before
+        """
+        matches: List[tuple] = []
+        cell_contract = self.cell_contract  # stored lowercased at init
+
+        # One JSON-RPC batch per chunk of blocks, chunks sent concurrently
+        block_nums = range(start_block, end_block + 1)
+        chunks = [
+            block_nums[i:i + BLOCK_BATCH_SIZE]
+            for i in range(0, len(block_nums), BLOCK_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(self._fetch_blocks(chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+        for chunk, blocks in zip(chunks, results):
+            if isinstance(blocks, BaseException):
+                logger.warning(
+                    "Failed to process blocks %d-%d: %s", chunk[0], chunk[-1], blocks
+                )
+                continue
+
+            for block_num, block in zip(chunk, blocks):
+                if block is None:
+                    logger.warning("Failed to process block %d: no result", block_num)
+                    continue
+
+                # Check if transaction involves CELL token contract; this rejects
+                # almost every tx, so do it before any per-tx hash work
+                for tx in _cell_txs(block.get("transactions", ()), cell_contract):
+                    # Seen set holds the raw 32 bytes rather than the hex string
+                    tx_hash = tx["hash"]
+                    hash_bytes = bytes.fromhex(tx_hash[2:])
+
+                    # Skip already seen; new ones are marked once the poll completes
+                    if hash_bytes not in self._seen_tx_hashes:
+                        # Raw node fields: quantities are hex, addresses lowercase
+                        event = TxEvent(
+                            chain=self.name,
+                            type="transaction",
+                            hash=tx_hash,
+                            block_number=block_num,
+                            from_=_checksum(tx["from"]),
+                            # Matched on the contract, so its checksum is already known
+                            to=self._cell_checksum,
+                            value=str(int(tx.get("value", "0x0"), 16)),
+                            gas_price=str(int(tx.get("gasPrice", "0x0"), 16)),
+                            contract=cell_contract,
+                        )
+                        matches.append((event, tx_hash))
+
+        return matches
+
+    async def poll_new_transactions(self) -> Iterable[TxEvent]:
         """
         Poll for new BSC transactions.
 
         Returns:
             List of transaction events
         """
-        events: List[dict] = []
+        events: List[TxEvent] = []
 
         try:
-            current_block = self.web3.eth.block_number
+            await self._ensure_session()
+            current_block = await self.web3.eth.block_number
             
             if self._last_block == 0:
                 # First run, only track from current block
@@ -68,82 +268,57 @@ class BSCWatcher(BaseChainWatcher):
 
             # Process blocks since last check (limit to avoid overload)
             start_block = max(self._last_block + 1, current_block - 100)
-            
-            for block_num in range(start_block, current_block + 1):
-                try:
-                    block = await asyncio.to_thread(
-                        self.web3.eth.get_block, block_num, full_transactions=True
-                    )
-                    
-                    for tx in block.get("transactions", []):
-                        tx_hash = tx["hash"].hex() if hasattr(tx["hash"], "hex") else tx["hash"]
-                        
-                        # Skip already seen
-                        if tx_hash in self._seen_tx_hashes:
-                            continue
-
-                        # Check if transaction involves CELL token contract
-                        to_addr = tx.get("to", "").lower() if tx.get("to") else ""
-                        if to_addr == self.cell_contract:
-                            self._seen_tx_hashes.add(tx_hash)
-                            
-                            event = {
-                                "chain": self.name,
-                                "type": "transaction",
-                                "hash": tx_hash,
-                                "block_number": block_num,
-                                "from": tx.get("from"),
-                                "to": tx.get("to"),
-                                "value": str(tx.get("value", 0)),
-                                "gas_price": str(tx.get("gasPrice", 0)),
-                                "contract": to_addr,
-                            }
-                            events.append(event)
-
-                except Exception as e:
-                    logger.warning("Failed to process block %d: %s", block_num, e)
-                    continue
 
-            self._last_block = current_block
+            # Scan block bodies rather than Transfer logs: reverted txs and
+            # non-transfer contract calls (approve, ...) emit no Transfer log
+            matches = await self._scan_blocks(start_block, current_block)
 
-            # Limit seen hashes cache
-            if len(self._seen_tx_hashes) > 10000:
-                self._seen_tx_hashes = set(list(self._seen_tx_hashes)[-5000:])
+            if matches:
+                await self._attach_receipts(matches)
+            events = [event for event, _ in matches]
+
+            # Mark seen and advance only now that nothing is left to await: a poll
+            # cancelled by its timeout changes neither, so its blocks are rescanned
+            for event in events:
+                self._seen_tx_hashes.add(bytes.fromhex(event.hash[2:]))
+            self._last_block = current_block
 
         except Exception as e:
             logger.error("Failed to poll BSC transactions: %s", e)
 
         return events
 
-    async def poll_mempool(self) -> Iterable[dict]:
+    async def poll_mempool(self) -> Iterable[TxEvent]:
         """
         Poll BSC mempool for pending transactions.
 
         Returns:
             List of pending transaction events
         """
-        events: List[dict] = []
+        events: List[TxEvent] = []
 
         try:
-            pending = await asyncio.to_thread(self.web3.eth.get_block, "pending", True)
-            
-            for tx in pending.get("transactions", [])[:20]:  # Limit to avoid overload
-                tx_hash = tx["hash"].hex() if hasattr(tx["hash"], "hex") else tx["hash"]
-                to_addr = tx.get("to", "").lower() if tx.get("to") else ""
-                
-                # Only track CELL token transactions
-                if to_addr == self.cell_contract:
-                    event = {
-                        "chain": self.name,
-                        "type": "pending",
-                        "hash": tx_hash,
-                        "from": tx.get("from"),
-                        "to": tx.get("to"),
-                        "value": str(tx.get("value", 0)),
-                        "gas_price": str(tx.get("gasPrice", 0)),
-                        "contract": to_addr,
-                    }
-                    events.append(event)
+            await self._ensure_session()
+            pending = await self._fetch_pending_block()
+            cell_contract = self.cell_contract
+
+            # Full bodies let the contract filter run over the whole pool without a
+            # lookup per tx; stop once enough CELL txs are found
+            for tx in pending.get("transactions", ()):
+                if (tx.get("to") or "").lower() != cell_contract:
+                    continue
+                events.append(TxEvent(
+                    chain=self.name,
+                    type="pending",
+                    hash=tx["hash"],
+                    from_=_checksum(tx["from"]),
+                    to=self._cell_checksum,
+                    value=str(int(tx.get("value", "0x0"), 16)),
+                    gas_price=str(int(tx.get("gasPrice", "0x0"), 16)),
+                    contract=cell_contract,
+                ))
+                if len(events) >= MEMPOOL_MATCH_LIMIT:
+                    break
 
         except Exception as e:
             logger.warning("Failed to poll BSC mempool: %s", e)
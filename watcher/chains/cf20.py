@@ -1,14 +1,69 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Set
+from operator import itemgetter
+from typing import Callable, Iterable, List, Optional, Set
 
-from watcher.chains.base import BaseChainWatcher
+from watcher.chains.base import BaseChainWatcher, SeenHashes
 from watcher.cf20_rpc import CF20RPCClient
 
 
 logger = logging.getLogger(__name__)
 
+# Event field -> keys a node may use for it, preferred first. As with
+# `tx.get(a) or tx.get(b)`, a falsy value falls through to the next key
+_TX_FIELD_ALIASES = (
+    ("from", "source_addr"),
+    ("to", "dest_addr"),
+    ("amount", "value"),
+    ("block", "block_number"),
+    ("timestamp", "ts"),
+)
+_PREFERRED_KEYS = itemgetter(*(aliases[0] for aliases in _TX_FIELD_ALIASES))
+
+
+def _lookup_fields(tx: dict) -> tuple:
+    """Resolve each field's aliases on tx itself."""
+    values = []
+    for aliases in _TX_FIELD_ALIASES:
+        value = None
+        for key in aliases:
+            value = value or tx.get(key)
+        values.append(value)
+    frm, to, amount, block, timestamp = values
+    return frm, to, amount, tx.get("token"), block, timestamp
+
+
+def _preferred_fields(tx: dict) -> tuple:
+    """Read the preferred keys in one call; anything missing or falsy is looked up."""
+    try:
+        values = _PREFERRED_KEYS(tx)
+    except KeyError:
+        return _lookup_fields(tx)
+    if not all(values):
+        return _lookup_fields(tx)
+    frm, to, amount, block, timestamp = values
+    return frm, to, amount, tx.get("token"), block, timestamp
+
+
+def _field_getter(sample: dict) -> Callable[[dict], tuple]:
+    """
+    Pick how to read event fields, once per response.
+
+    A node usually answers with one schema, so the first tx decides: if it
+    has every preferred key set, txs are read with a single itemgetter call,
+    otherwise every tx has its aliases looked up.
+
+    Returns:
+        Callable mapping a tx to (from, to, amount, token, block, timestamp)
+    """
+    try:
+        if all(_PREFERRED_KEYS(sample)):
+            return _preferred_fields
+    except KeyError:
+        pass
+    return _lookup_fields
+
 
 class CF20Watcher(BaseChainWatcher):
     """Watcher for Cellframe CF-20 blockchain."""
@@ -21,6 +76,7 @@ class CF20Watcher(BaseChainWatcher):
         network: str = "backbone",
         poll_interval: int = 60,
         confirmations_required: int = 5,
+        seen_hashes_path: Optional[str] = None,
     ) -> None:
         """
         Initialize CF-20 watcher.
@@ -30,14 +86,59 @@ class CF20Watcher(BaseChainWatcher):
             network: Network name (backbone, kelvpn)
             poll_interval: Polling interval in seconds
             confirmations_required: Number of confirmations needed
+            seen_hashes_path: File that keeps seen tx hashes across restarts
         """
         super().__init__(poll_interval=poll_interval)
         self.rpc_client = CF20RPCClient(rpc_url, network)
         self.network = network
         self.confirmations_required = confirmations_required
-        self._seen_tx_hashes: Set[str] = set()
+        # History polls return the latest txs again after a restart; the saved
+        # hashes keep those from being re-reported
+        self._seen_hashes_path = seen_hashes_path
+        self._seen_dirty = False
+        if seen_hashes_path:
+            self._seen_tx_hashes = SeenHashes.load(seen_hashes_path, maxlen=10000)
+        else:
+            self._seen_tx_hashes = SeenHashes(maxlen=10000)
         self._last_checked_addresses: Set[str] = set()
 
+    async def aclose(self) -> None:
+        """Save seen hashes and close the RPC client's connection pool."""
+        await self._save_seen()
+        await self.rpc_client.aclose()
+
+    async def _save_seen(self) -> None:
+        """
+        Persist hashes recorded since the last save.
+
+        Runs before a poll rather than after it: a poll cancelled by its
+        timeout while saving would lose events already marked seen.
+        """
+        if not (self._seen_dirty and self._seen_hashes_path):
+            return
+        # save() snapshots the hashes before its first await
+        self._seen_dirty = False
+        try:
+            await self._seen_tx_hashes.save(self._seen_hashes_path)
+        except OSError as e:
+            self._seen_dirty = True
+            logger.warning("Failed to save CF-20 seen hashes: %s", e)
+
+    def _polls(self) -> tuple:
+        # History and mempool travel in one JSON-RPC batch instead of two POSTs
+        return (self.poll_batched,)
+
+    async def poll_batched(self) -> List[dict]:
+        """
+        Poll CF-20 history and mempool with a single batched RPC request.
+
+        Returns:
+            New transaction events followed by mempool events
+        """
+        await self._save_seen()
+        recent_txs, mempool_txs = await self.rpc_client.poll_batched(limit=50)
+        return self._history_events(recent_txs) + self._mempool_events(mempool_txs)
+
     async def poll_new_transactions(self) -> Iterable[dict]:
         """
         Poll for new CF-20 transactions.
@@ -45,13 +146,28 @@ class CF20Watcher(BaseChainWatcher):
         Returns:
             List of transaction events
         """
+        # Get general transaction history
+        # In real implementation, track specific addresses from active sessions
+        await self._save_seen()
+        recent_txs = await self.rpc_client.tx_history(limit=50)
+        return self._history_events(recent_txs)
+
+    async def poll_mempool(self) -> Iterable[dict]:
+        """
+        Poll CF-20 mempool for pending transactions.
+
+        Returns:
+            List of mempool transaction events
+        """
+        mempool_txs = await self.rpc_client.mempool_list()
+        return self._mempool_events(mempool_txs)
+
+    def _history_events(self, recent_txs: List[dict]) -> List[dict]:
+        """Build events for history transactions not seen before."""
         events: List[dict] = []
+        fields = None
 
         try:
-            # Get general transaction history
-            # In real implementation, track specific addresses from active sessions
-            recent_txs = await self.rpc_client.tx_history(limit=50)
-
             for tx in recent_txs:
                 tx_hash = tx.get("hash") or tx.get("tx_hash")
                 
@@ -63,6 +179,11 @@ class CF20Watcher(BaseChainWatcher):
                     continue
 
                 self._seen_tx_hashes.add(tx_hash)
+                self._seen_dirty = True
+
+                if fields is None:
+                    fields = _field_getter(tx)
+                frm, to, amount, token, block, timestamp = fields(tx)
 
                 # Create event for processing
                 event = {
@@ -71,55 +192,48 @@ class CF20Watcher(BaseChainWatcher):
                     "type": "transaction",
                     "hash": tx_hash,
                     "status": tx.get("status", "pending"),
-                    "from": tx.get("from") or tx.get("source_addr"),
-                    "to": tx.get("to") or tx.get("dest_addr"),
-                    "amount": tx.get("amount") or tx.get("value"),
-                    "token": tx.get("token"),
-                    "block": tx.get("block") or tx.get("block_number"),
-                    "timestamp": tx.get("timestamp") or tx.get("ts"),
+                    "from": frm,
+                    "to": to,
+                    "amount": amount,
+                    "token": token,
+                    "block": block,
+                    "timestamp": timestamp,
                 }
 
                 events.append(event)
 
-            # Limit seen hashes cache size
-            if len(self._seen_tx_hashes) > 10000:
-                # Keep only recent half
-                self._seen_tx_hashes = set(list(self._seen_tx_hashes)[-5000:])
-
         except Exception as e:
             logger.error("Failed to poll CF-20 transactions: %s", e)
 
         return events
 
-    async def poll_mempool(self) -> Iterable[dict]:
-        """
-        Poll CF-20 mempool for pending transactions.
-
-        Returns:
-            List of mempool transaction events
-        """
+    def _mempool_events(self, mempool_txs: List[dict]) -> List[dict]:
+        """Build events for transactions currently in the mempool."""
         events: List[dict] = []
+        fields = None
 
         try:
-            mempool_txs = await self.rpc_client.mempool_list()
-
             for tx in mempool_txs:
                 tx_hash = tx.get("hash") or tx.get("tx_hash")
                 
                 if not tx_hash:
                     continue
 
+                if fields is None:
+                    fields = _field_getter(tx)
+                frm, to, amount, token, _, timestamp = fields(tx)
+
                 event = {
                     "chain": self.name,
                     "network": self.network,
                     "type": "mempool",
                     "hash": tx_hash,
                     "status": "pending",
-                    "from": tx.get("from") or tx.get("source_addr"),
-                    "to": tx.get("to") or tx.get("dest_addr"),
-                    "amount": tx.get("amount") or tx.get("value"),
-                    "token": tx.get("token"),
-                    "timestamp": tx.get("timestamp") or tx.get("ts"),
+                    "from": frm,
+                    "to": to,
+                    "amount": amount,
+                    "token": token,
+                    "timestamp": timestamp,
                 }
 
                 events.append(event)
@@ -188,16 +302,19 @@ class CF20Watcher(BaseChainWatcher):
             List of transaction events
         """
         events: List[dict] = []
+        fields = None
 
         try:
-            txs = await self.rpc_client.tx_all_history(address)
-
-            for tx in txs:
+            async for tx in self.rpc_client.iter_tx_all_history(address):
                 tx_hash = tx.get("hash") or tx.get("tx_hash")
                 
                 if not tx_hash:
                     continue
 
+                if fields is None:
+                    fields = _field_getter(tx)
+                frm, to, amount, token, block, timestamp = fields(tx)
+
                 event = {
                     "chain": self.name,
                     "network": self.network,
@@ -205,12 +322,12 @@ class CF20Watcher(BaseChainWatcher):
                     "address": address,
                     "hash": tx_hash,
                     "status": tx.get("status", "pending"),
-                    "from": tx.get("from") or tx.get("source_addr"),
-                    "to": tx.get("to") or tx.get("dest_addr"),
-                    "amount": tx.get("amount") or tx.get("value"),
-                    "token": tx.get("token"),
-                    "block": tx.get("block") or tx.get("block_number"),
-                    "timestamp": tx.get("timestamp") or tx.get("ts"),
+                    "from": frm,
+                    "to": to,
+                    "amount": amount,
+                    "token": token,
+                    "block": block,
+                    "timestamp": timestamp,
                 }
 
                 events.append(event)
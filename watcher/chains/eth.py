@@ -1,21 +1,24 @@
 from __future__ import annotations
 
-import asyncio
 import logging
-from typing import Iterable, List, Set
+from typing import Iterable, List, Optional
 
-from web3 import Web3
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
 try:
     from web3.middleware import ExtraDataToPOAMiddleware as geth_poa_middleware
+    async_geth_poa_middleware = geth_poa_middleware
 except ImportError:
-    from web3.middleware import geth_poa_middleware
+    from web3.middleware import async_geth_poa_middleware, geth_poa_middleware
 
-from watcher.chains.base import BaseChainWatcher
+from watcher.chains.base import BaseChainWatcher, SeenHashes, TxEvent
 from watcher.evm_tracker import EVMTransactionTracker
 
 
 logger = logging.getLogger(__name__)
 
+# Max CELL transactions reported per mempool poll
+MEMPOOL_MATCH_LIMIT = 20
+
 
 class EthereumWatcher(BaseChainWatcher):
     """Watcher for Ethereum blockchain."""
@@ -29,6 +32,7 @@ class EthereumWatcher(BaseChainWatcher):
         poll_interval: int = 30,
         confirmations_required: int = 12,
         cell_contract_address: str = "0x26c8afbbfe1ebaca03c2bb082e69d0476bffe099",
+        chain_id: Optional[int] = None,
     ) -> None:
         """
         Initialize Ethereum watcher.
@@ -39,28 +43,53 @@ class EthereumWatcher(BaseChainWatcher):
             poll_interval: Polling interval in seconds
             confirmations_required: Number of confirmations needed
             cell_contract_address: CELL ERC-20 token contract address
+            chain_id: Chain ID of the endpoint; fetched on the first poll if omitted
         """
         super().__init__(poll_interval=poll_interval)
-        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
-        if self.web3.eth.chain_id in (56, 97):
-            self.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        # EVMTransactionTracker works with a sync Web3 instance
+        tracker_web3 = Web3(Web3.HTTPProvider(rpc_url))
+        # Polling awaits the node directly on the event loop instead of via to_thread
+        self.web3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
         self.etherscan_api_key = etherscan_api_key
         self.cell_contract = cell_contract_address.lower()
-        self.tracker = EVMTransactionTracker(self.web3, confirmations_required)
-        self._seen_tx_hashes: Set[str] = set()
+        self.tracker = EVMTransactionTracker(tracker_web3, confirmations_required)
+        self._seen_tx_hashes = SeenHashes(maxlen=10000)
         self._last_block: int = 0
-
-    async def poll_new_transactions(self) -> Iterable[dict]:
+        # No blocking chain_id RPC at construction; resolved on the first poll
+        self.chain_id: Optional[int] = None
+        if chain_id is not None:
+            self._set_chain_id(chain_id)
+
+    def _set_chain_id(self, chain_id: int) -> None:
+        """Record the chain ID and add POA middleware for BSC endpoints."""
+        self.chain_id = chain_id
+        if chain_id in (56, 97):
+            self.tracker.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            self.web3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+
+    async def prepare(self) -> None:
+        if self.chain_id is None:
+            try:
+                self._set_chain_id(await self.web3.eth.chain_id)
+            except Exception as e:
+                logger.warning("Failed to get chain id, retrying next poll: %s", e)
+
+    async def aclose(self) -> None:
+        """Close the async provider's HTTP session."""
+        await self.web3.provider.disconnect()
+
+    async def poll_new_transactions(self) -> Iterable[TxEvent]:
         """
         Poll for new Ethereum transactions.
 
         Returns:
             List of transaction events
         """
-        events: List[dict] = []
+        events: List[TxEvent] = []
+        new_hashes: List[bytes] = []
 
         try:
-            current_block = self.web3.eth.block_number
+            current_block = await self.web3.eth.block_number
             
             if self._last_block == 0:
                 # First run, only track from current block
@@ -69,82 +98,86 @@ class EthereumWatcher(BaseChainWatcher):
 
             # Process blocks since last check (limit to avoid overload)
             start_block = max(self._last_block + 1, current_block - 100)
+            cell_contract = self.cell_contract  # stored lowercased at init
             
             for block_num in range(start_block, current_block + 1):
                 try:
-                    block = await asyncio.to_thread(
-                        self.web3.eth.get_block, block_num, full_transactions=True
-                    )
+                    block = await self.web3.eth.get_block(block_num, full_transactions=True)
                     
                     for tx in block.get("transactions", []):
-                        tx_hash = tx["hash"].hex() if hasattr(tx["hash"], "hex") else tx["hash"]
-                        
-                        # Skip already seen
-                        if tx_hash in self._seen_tx_hashes:
+                        # Check if transaction involves CELL token contract; this rejects
+                        # almost every tx, so do it before any per-tx hash work
+                        to_addr = tx.get("to")
+                        if to_addr is None or to_addr.lower() != cell_contract:
                             continue
 
-                        # Check if transaction involves CELL token contract
-                        to_addr = tx.get("to", "").lower() if tx.get("to") else ""
-                        if to_addr == self.cell_contract:
-                            self._seen_tx_hashes.add(tx_hash)
-                            
-                            event = {
-                                "chain": self.name,
-                                "type": "transaction",
-                                "hash": tx_hash,
-                                "block_number": block_num,
-                                "from": tx.get("from"),
-                                "to": tx.get("to"),
-                                "value": str(tx.get("value", 0)),
-                                "gas_price": str(tx.get("gasPrice", 0)),
-                                "contract": to_addr,
-                            }
+                        # Raw 32-byte HexBytes hash; hex is only built for the event
+                        tx_hash = tx["hash"]
+
+                        # Skip already seen; new ones are marked once the poll completes
+                        if tx_hash not in self._seen_tx_hashes:
+                            new_hashes.append(tx_hash)
+                            event = TxEvent(
+                                chain=self.name,
+                                type="transaction",
+                                # bytes.hex never adds a prefix, whatever the hexbytes version
+                                hash="0x" + bytes.hex(tx_hash),
+                                block_number=block_num,
+                                from_=tx.get("from"),
+                                to=tx.get("to"),
+                                value=str(tx.get("value", 0)),
+                                gas_price=str(tx.get("gasPrice", 0)),
+                                contract=cell_contract,
+                            )
                             events.append(event)
 
                 except Exception as e:
                     logger.warning("Failed to process block %d: %s", block_num, e)
                     continue
 
+            # Mark seen and advance only now that nothing is left to await: a poll
+            # cancelled by its timeout changes neither, so its blocks are rescanned
+            for tx_hash in new_hashes:
+                self._seen_tx_hashes.add(tx_hash)
             self._last_block = current_block
 
-            # Limit seen hashes cache
-            if len(self._seen_tx_hashes) > 10000:
-                self._seen_tx_hashes = set(list(self._seen_tx_hashes)[-5000:])
-
         except Exception as e:
             logger.error("Failed to poll Ethereum transactions: %s", e)
 
         return events
 
-    async def poll_mempool(self) -> Iterable[dict]:
+    async def poll_mempool(self) -> Iterable[TxEvent]:
         """
         Poll Ethereum mempool for pending transactions.
 
         Returns:
             List of pending transaction events
         """
-        events: List[dict] = []
+        events: List[TxEvent] = []
 
         try:
-            pending = await asyncio.to_thread(self.web3.eth.get_block, "pending", True)
+            pending = await self.web3.eth.get_block("pending", True)
             
-            for tx in pending.get("transactions", [])[:20]:  # Limit to avoid overload
-                tx_hash = tx["hash"].hex() if hasattr(tx["hash"], "hex") else tx["hash"]
+            for tx in pending.get("transactions", ()):
                 to_addr = tx.get("to", "").lower() if tx.get("to") else ""
                 
                 # Only track CELL token transactions
                 if to_addr == self.cell_contract:
-                    event = {
-                        "chain": self.name,
-                        "type": "pending",
-                        "hash": tx_hash,
-                        "from": tx.get("from"),
-                        "to": tx.get("to"),
-                        "value": str(tx.get("value", 0)),
-                        "gas_price": str(tx.get("gasPrice", 0)),
-                        "contract": to_addr,
-                    }
+                    tx_hash = "0x" + bytes.hex(tx["hash"])
+                    event = TxEvent(
+                        chain=self.name,
+                        type="pending",
+                        hash=tx_hash,
+                        from_=tx.get("from"),
+                        to=tx.get("to"),
+                        value=str(tx.get("value", 0)),
+                        gas_price=str(tx.get("gasPrice", 0)),
+                        contract=to_addr,
+                    )
                     events.append(event)
+                    # Cap the matches, not the pool: CELL txs are rare among pending txs
+                    if len(events) >= MEMPOOL_MATCH_LIMIT:
+                        break
 
         except Exception as e:
             logger.warning("Failed to poll Ethereum mempool: %s", e)
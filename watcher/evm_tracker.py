@@ -5,9 +5,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from web3 import Web3
+from web3.exceptions import TransactionNotFound
 from web3.types import TxReceipt
 
 
@@ -73,6 +74,26 @@ class EVMTransactionTracker:
             logger.warning("Failed to get receipt for tx %s: %s", tx_hash, e)
             return None
 
+    def _fetch_status_batch(self, tx_hash: str) -> List[Dict[str, Any]]:
+        """
+        Fetch transaction, head block number and receipt in one JSON-RPC batch.
+
+        Goes through the provider directly: web3's formatted batch fails as a
+        whole when a pending transaction has no receipt yet.
+
+        Returns:
+            Raw responses in request order, each with a "result" or an "error"
+        """
+        responses = self.web3.provider.make_batch_request([
+            ("eth_getTransactionByHash", [tx_hash]),
+            ("eth_blockNumber", []),
+            ("eth_getTransactionReceipt", [tx_hash]),
+        ])
+        if not isinstance(responses, list):
+            # The node rejected the batch as a whole
+            raise ValueError(responses.get("error", responses))
+        return responses
+
     async def get_transaction_status(self, tx_hash: str) -> Dict[str, any]:
         """
         Get comprehensive transaction status.
@@ -95,25 +116,47 @@ class EVMTransactionTracker:
         }
 
         try:
-            # Try to get transaction
-            tx = await asyncio.to_thread(self.web3.eth.get_transaction, tx_hash)
+            # One round trip instead of three; raw results carry hex quantities
+            tx_response, block_response, receipt_response = await asyncio.to_thread(
+                self._fetch_status_batch, tx_hash
+            )
+            # Errors come back per call; each is handled like the separate lookups were
+            if "error" in tx_response:
+                raise ValueError(tx_response["error"])
+            tx = tx_response.get("result")
+            if tx is None:
+                raise TransactionNotFound(f"Transaction with hash: '{tx_hash}' not found.")
             status["exists"] = True
 
             if tx.get("blockNumber") is None:
                 status["pending"] = True
                 return status
 
-            status["block_number"] = tx["blockNumber"]
+            block_number = int(tx["blockNumber"], 16)
+            status["block_number"] = block_number
             
             # Get confirmations
-            confirmations = await self.get_transaction_confirmations(tx_hash)
+            if "error" in block_response:
+                logger.error(
+                    "Failed to get confirmations for tx %s: %s",
+                    tx_hash,
+                    block_response["error"],
+                )
+                confirmations = 0
+            else:
+                current_block = int(block_response["result"], 16)
+                confirmations = max(0, current_block - block_number + 1)
             status["confirmations"] = confirmations
             status["confirmed"] = confirmations >= self.confirmations_required
 
-            # Get receipt to check success
-            receipt = await self.get_transaction_receipt(tx_hash)
-            if receipt:
-                status["success"] = receipt.get("status") == 1
+            # Check receipt for success
+            receipt = receipt_response.get("result")
+            if "error" in receipt_response:
+                logger.warning(
+                    "Failed to get receipt for tx %s: %s", tx_hash, receipt_response["error"]
+                )
+            elif receipt:
+                status["success"] = int(receipt.get("status", "0x0"), 16) == 1
                 if not status["success"]:
                     status["error"] = "Transaction failed (reverted)"
 
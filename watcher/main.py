@@ -42,6 +42,7 @@ def build_scheduler() -> PollingScheduler:
     cf_network = os.getenv("CF_NETWORK", "backbone")
     cf_poll_interval = int(os.getenv("CF_POLL_INTERVAL", "120"))
     cf_confirmations = int(os.getenv("CF_CONFIRMATIONS_REQUIRED", "5"))
+    cf_seen_hashes = os.getenv("CF_SEEN_HASHES_PATH")
 
     logger.info("Initializing watchers...")
     logger.info("  - Ethereum: %s (confirmations: %d, interval: %ds)", 
@@ -71,6 +72,7 @@ def build_scheduler() -> PollingScheduler:
             network=cf_network,
             poll_interval=cf_poll_interval,
             confirmations_required=cf_confirmations,
+            seen_hashes_path=cf_seen_hashes,
         ),
     ]
     
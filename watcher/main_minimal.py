@@ -83,12 +83,14 @@ def build_scheduler() -> PollingScheduler:
             cf_network = os.getenv("CF_NETWORK", "backbone")
             cf_poll_interval = int(os.getenv("CF_POLL_INTERVAL", "120"))
             cf_confirmations = int(os.getenv("CF_CONFIRMATIONS_REQUIRED", "5"))
+            cf_seen_hashes = os.getenv("CF_SEEN_HASHES_PATH")
 
             watchers.append(CF20Watcher(
                 rpc_url=cf_rpc,
                 network=cf_network,
                 poll_interval=cf_poll_interval,
                 confirmations_required=cf_confirmations,
+                seen_hashes_path=cf_seen_hashes,
             ))
             logger.info("✅ CF-20 watcher enabled: %s (network: %s)", cf_rpc, cf_network)
         except Exception as e:
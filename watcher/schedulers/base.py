@@ -19,12 +19,21 @@ class PollingScheduler:
 
     async def run(self) -> None:
         tasks = [asyncio.create_task(self._run_watcher(watcher)) for watcher in self.watchers]
-        await asyncio.gather(*tasks)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Release pooled connections on shutdown/cancellation
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(
+                *(watcher.aclose() for watcher in self.watchers),
+                return_exceptions=True,
+            )
 
     async def _run_watcher(self, watcher: BaseChainWatcher) -> None:
         logger.info("Starting watcher: %s", watcher.name)
         while True:
-            events = await watcher.collect()
-            for event in events:
-                enqueue_event(event)
+            # Enqueue each poll's events as soon as that poll is done
+            async for event in watcher.stream():
+                await enqueue_event(event)
             await asyncio.sleep(watcher.poll_interval)
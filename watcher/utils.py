@@ -1,24 +1,34 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Union
 
-from redis import Redis
-from rq import Queue
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
 
 from bot.config import get_bot_config
+from watcher.chains.base import TxEvent
 
 
 logger = logging.getLogger(__name__)
 
+_pool: Optional[ArqRedis] = None
 
-def get_queue(name: str = "watcher") -> Queue:
-    config = get_bot_config()
-    connection = Redis.from_url(config.redis_url)
-    return Queue(name, connection=connection)
 
+async def get_queue() -> ArqRedis:
+    global _pool
+    if _pool is None:
+        config = get_bot_config()
+        _pool = await create_pool(RedisSettings.from_dsn(config.redis_url))
+    return _pool
 
-def enqueue_event(event: Dict[str, Any], queue_name: str = "watcher") -> None:
-    queue = get_queue(queue_name)
+
+async def enqueue_event(
+    event: Union[Dict[str, Any], TxEvent], queue_name: str = "watcher"
+) -> None:
+    if isinstance(event, TxEvent):
+        # Workers receive plain dicts, not watcher classes
+        event = event.to_dict()
+    queue = await get_queue()
     logger.debug("Enqueuing event: %s", event)
-    queue.enqueue("queue.tasks.process_event", event)
+    await queue.enqueue_job("process_event", event, _queue_name=queue_name)
@@ -11,6 +11,8 @@ from eth_utils import is_address as is_eth_address
 
 ChainType = Literal["ethereum", "bsc", "cf20"]
 
+_TX_HASH_RE = re.compile(r"0x[0-9a-fA-F]{64}")
+
 
 def validate_eth_address(address: str) -> bool:
     """
@@ -57,6 +59,22 @@ def validate_cf20_address(address: str) -> bool:
     return True
 
 
+def validate_tx_hash(tx_hash: str) -> bool:
+    """
+    Validate Ethereum/BSC transaction hash format.
+
+    Args:
+        tx_hash: Transaction hash string to validate
+
+    Returns:
+        True if hash is 0x followed by 64 hex characters
+    """
+    if not tx_hash or not isinstance(tx_hash, str):
+        return False
+
+    return _TX_HASH_RE.fullmatch(tx_hash) is not None
+
+
 def validate_address(address: str, chain: ChainType) -> bool:
     """
     Validate address for specific blockchain.
@@ -98,6 +116,7 @@ __all__ = [
     "validate_eth_address",
     "validate_cf20_address",
     "validate_address",
+    "validate_tx_hash",
     "normalize_eth_address",
     "ChainType",
 ]